@@ -54,11 +54,11 @@ def getAnimalTable(jsonPath):
     
     if data['itemToDrop']['m_PathID'] != 0:
         logging.debug(f"Found expected drop {data['itemToDrop']['m_PathID']} for {obj.name}")
-        obj.expected_drop = Drop(0, str(data['itemToDrop']['m_PathID']), -1, "", 1.0, data['amountToDrop'])
+        obj.expected_drop = Drop(0, data['itemToDrop']['m_PathID'], -1, "", 1.0, data['amountToDrop'])
         
     if data['goldenDrop']['m_PathID'] != 0:
         logging.debug(f"Found golden drop {data['goldenDrop']['m_PathID']} for {obj.name}")
-        obj.golden_drop = Drop(0, str(data['goldenDrop']['m_PathID']), -1, "", 1.0, 1)
+        obj.golden_drop = Drop(0, data['goldenDrop']['m_PathID'], -1, "", 1.0, 1)
     
     # Iterating through the json list
     if ('_drops' in data):
@@ -69,7 +69,7 @@ def getAnimalTable(jsonPath):
                 
                 for i in (d['drops']):
                     obj.drops.append(
-                        Drop(drop_index, str(i['drop']['m_PathID']), -1, "", float(i['dropChance']), i['dropAmount'])
+                        Drop(drop_index, i['drop']['m_PathID'], -1, "", float(i['dropChance']), i['dropAmount'])
                     )
             
             try:
@@ -65,7 +65,7 @@ def getDestructible(jsonPath):
         
         for i in drops:
             obj.drops.append(
-                Drop(1, str(i['drop']['m_PathID']), -1, "", float(i['dropChance']), i['dropAmount'])
+                Drop(1, i['drop']['m_PathID'], -1, "", float(i['dropChance']), i['dropAmount'])
             )
     
         try:
@@ -33,8 +33,18 @@ class Enemy(EntityWithDrops):
         
         return ret
     
+    @property
+    def identity(self) -> tuple:
+        """
+        Enemies with the same name, level and spawner are the same enemy, even from different files.
+        """
+        return (self.name, self.level, self.spawner)
+    
     def __eq__(self, __value: object) -> bool:
-        return self.name == __value.name and self.level == __value.level and self.spawner == __value.spawner
+        return self.identity == __value.identity
+    
+    def __hash__(self) -> int:
+        return hash(self.identity)
 
 class Item(EntityWithDrops):
     def __init__(self):
@@ -54,7 +64,7 @@ def getDropTable(jsonPath):
         
         for i in drops:
             obj.drops.append(
-                Drop(1, str(i['drop']['m_PathID']), -1, "", float(i['dropChance']), i['dropAmount'])
+                Drop(1, i['drop']['m_PathID'], -1, "", float(i['dropChance']), i['dropAmount'])
             )
     
         try:
@@ -89,7 +99,7 @@ def getDropTable(jsonPath):
                 
                 for i in (d['drops']):
                     obj.drops.append(
-                        Drop(drop_index, str(i['drop']['m_PathID']), -1, "", float(i['dropChance']), i['dropAmount'])
+                        Drop(drop_index, i['drop']['m_PathID'], -1, "", float(i['dropChance']), i['dropAmount'])
                     )
             
             try:
@@ -3,6 +3,9 @@ import json
 
 from DesktopApp.datum import Datum
 
+seasons = ['All', 'Spring', 'Summer', 'Fall', 'Winter']
+maxLevel = 120
+
 class FishSpawner:
     def __init__(self):
         self.drops = []
@@ -29,67 +32,75 @@ class FishSpawner:
         else:
             return 1
     
-    def _calculate_percentages(self, drops, level, familiar_waters_value=0.0, advanced_fish_mapping_value=0.0):
-        result = []
+    def _rarity_adjustment(self, rarity, familiar_waters_value, advanced_fish_mapping_value):
+        adjustment = 1.0
+        if rarity == 'Epic':
+            adjustment += 0.05 * familiar_waters_value
+        elif rarity == 'Legendary':
+            adjustment += 0.05 * familiar_waters_value + 0.1 * advanced_fish_mapping_value
+        return adjustment
+    
+    def catch_table(self, levels=range(1, maxLevel + 1), familiar_waters_values=(0.0,), advanced_fish_mapping_values=(0.0,)):
+        """
+        Works out the % chance of catching each fish for every combination of level, 
+        Familiar Waters and Advanced Fish Mapping, in one pass over the drops per season.
         
-        num = 0.0
-        num2 = 0.0
-        if familiar_waters_value:
-            num += 0.05 * familiar_waters_value
-        if advanced_fish_mapping_value:
-            num2 += 0.1 * advanced_fish_mapping_value
+        Returns {season: {(level, familiar_waters, advanced_fish_mapping): [percent]}},
+        where the percents line up with that season's drops in self.drops.
+        """
+        levels = list(levels)
+        table = {}
         
-        total_probability = 0.0
-        for fish_loot in drops:
-            num3 = 1.0
-            fish_rarity = fish_loot.rarity
-            if fish_rarity == 'Epic':
-                num3 += num
-            elif fish_rarity == 'Legendary':
-                num3 += num + num2
+        for season in seasons:
+            seasonal_drops = [drop for drop in self.drops if drop.season == season]
+            rarities = {drop.rarity for drop in seasonal_drops}
             
-            adjusted_odds = self._adjusted_odds_based_on_rarity_and_level(fish_loot.rarity, level)
-            total_probability += fish_loot.chance * num3 * adjusted_odds
-        
-        num5 = 0.0
-        for fish_loot in drops:
-            rarity_adjustment = 1.0
-            fish_rarity = fish_loot.rarity
-            if fish_rarity == 'Epic':
-                rarity_adjustment += num
-            elif fish_rarity == 'Legendary':
-                rarity_adjustment += num + num2
+            # Odds only depend on rarity and level, and adjustments on rarity and skills, so work them out once each
+            odds = {(rarity, level): self._adjusted_odds_based_on_rarity_and_level(rarity, level) for rarity in rarities for level in levels}
             
-            adjusted_odds = self._adjusted_odds_based_on_rarity_and_level(fish_loot.rarity, level)
-            num5 = fish_loot.chance * rarity_adjustment * adjusted_odds
+            season_table = {}
+            for familiar_waters in familiar_waters_values:
+                for advanced_fish_mapping in advanced_fish_mapping_values:
+                    adjustments = {rarity: self._rarity_adjustment(rarity, familiar_waters, advanced_fish_mapping) for rarity in rarities}
+                    
+                    for level in levels:
+                        weights = [drop.chance * adjustments[drop.rarity] * odds[(drop.rarity, level)] for drop in seasonal_drops]
+                        
+                        total_probability = sum(weights)
+                        if total_probability:
+                            percents = [(weight / total_probability) * 100 for weight in weights]
+                        else:
+                            percents = [0.0] * len(weights)
+                        
+                        season_table[(level, familiar_waters, advanced_fish_mapping)] = percents
+                        
+            table[season] = season_table
             
-            result.append({
-                'path_id': fish_loot.pID,
-                'percent': (num5 / total_probability) * 100,
-            })
-
-        return result
+        return table
     
     def _calculate_min_max_percents(self):
-        for season in ['All', 'Spring', 'Summer', 'Fall', 'Winter']:
+        min_table = self.catch_table(levels=[1])
+        max_table = self.catch_table(
+            levels=[70], 
+            familiar_waters_values=[15], 
+            advanced_fish_mapping_values=[30]
+        )
+        
+        for season in seasons:
             seasonal_drops = [drop for drop in self.drops if drop.season == season]
+            min_percents = min_table[season][(1, 0.0, 0.0)]
+            max_percents = max_table[season][(70, 15, 30)]
             
-            min_percents = self._calculate_percentages(seasonal_drops, level=1)
-            max_percents = self._calculate_percentages(
-                seasonal_drops,
-                level=70, 
-                familiar_waters_value=15, 
-                advanced_fish_mapping_value=30
-            )
-            
-            for drop in seasonal_drops:
-                matching_min = [fish for fish in min_percents if fish['path_id'] == drop.pID]
-                if matching_min:
-                    drop.min_percent_chance = matching_min[0]['percent']
-                    
-                matching_max = [fish for fish in max_percents if fish['path_id'] == drop.pID]
-                if matching_max:
-                    drop.max_percent_chance = matching_max[0]['percent']
+            for drop, min_percent, max_percent in zip(seasonal_drops, min_percents, max_percents):
+                drop.min_percent_chance = min_percent
+                drop.max_percent_chance = max_percent
+    
+    def signature(self) -> tuple:
+        """
+        The spawner's fish table, as a hashable tuple of (name, chance, season) in drop order.
+        Spawners with the same signature catch exactly the same fish.
+        """
+        return tuple((drop.name, drop.chance, drop.season) for drop in self.drops)
     
     def calculate_percent_chance(self):
         self._calculate_min_max_percents()
@@ -106,6 +117,8 @@ class FishSpawner:
         return result
     
 class FishSpawnable:
+    __slots__ = ('pID', 'gID', 'name', 'chance', 'season', 'rarity', 'min_percent_chance', 'max_percent_chance')
+
     def __init__(self, pID, gID, name, chance, season):
         self.pID = pID
         self.gID = gID
@@ -131,29 +144,29 @@ def getFishSpawner(jsonPath) -> FishSpawner:
     # Iterating through the json list
     for i in data['fish']['drops']:
         spawner.drops.append(
-            FishSpawnable(str(i['fish']['m_PathID']), -1, '',
+            FishSpawnable(i['fish']['m_PathID'], -1, '',
             float(i['dropChance']), 'All')
         )
 
     if data['hasSeasonalFish']:
         for i in data['fishSpring']['drops']:
             spawner.drops.append(
-                FishSpawnable(str(i['fish']['m_PathID']), -1, '',
+                FishSpawnable(i['fish']['m_PathID'], -1, '',
                 float(i['dropChance']), 'Spring')
             )
         for i in data['fishSummer']['drops']:
             spawner.drops.append(
-                FishSpawnable(str(i['fish']['m_PathID']), -1, '',
+                FishSpawnable(i['fish']['m_PathID'], -1, '',
                 float(i['dropChance']), 'Summer')
             )
         for i in data['fishFall']['drops']:
             spawner.drops.append(
-                FishSpawnable(str(i['fish']['m_PathID']), -1, '',
+                FishSpawnable(i['fish']['m_PathID'], -1, '',
                 float(i['dropChance']), 'Fall')
             )
         for i in data['fishWinter']['drops']:
             spawner.drops.append(
-                FishSpawnable(str(i['fish']['m_PathID']), -1, '',
+                FishSpawnable(i['fish']['m_PathID'], -1, '',
                 float(i['dropChance']), 'Winter')
             )
 
@@ -8,6 +8,8 @@ class FishingNet:
     self.drops = drops
     
 class Netable:
+  __slots__ = ('pID', 'gID', 'name', 'assetType', 'chance')
+
   def __init__(self, pID, gID, name, assetType, chance):
     self.pID = pID
     self.gID = gID
@@ -24,13 +26,13 @@ def getFishingNet(jsonPath):
     
     # Iterating through the json list
     for i in data['fish']['drops']:
-        net.drops.append(Netable(str(i['drop']['m_PathID']), -1, '', 'Fish', str(i['dropChance'])))
+        net.drops.append(Netable(i['drop']['m_PathID'], -1, '', 'Fish', str(i['dropChance'])))
     for i in data['oceanFish']['drops']:
-        net.drops.append(Netable(str(i['drop']['m_PathID']), -1, '', 'Ocean Fish', str(i['dropChance'])))
+        net.drops.append(Netable(i['drop']['m_PathID'], -1, '', 'Ocean Fish', str(i['dropChance'])))
     for i in data['craftableItems']['drops']:
-        net.drops.append(Netable(str(i['drop']['m_PathID']), -1, '', 'Craftables', str(i['dropChance'])))
+        net.drops.append(Netable(i['drop']['m_PathID'], -1, '', 'Craftables', str(i['dropChance'])))
     for i in data['smallFish']['drops']:
-        net.drops.append(Netable(str(i['drop']['m_PathID']), -1, '', 'Small Fish', str(i['dropChance'])))
+        net.drops.append(Netable(i['drop']['m_PathID'], -1, '', 'Small Fish', str(i['dropChance'])))
     # Closing file
     f.close()
 
@@ -18,6 +18,8 @@ class GiftTable:
     self.filename = ""
 
 class Giftable:
+  __slots__ = ('pID', 'gID', 'name', 'tier', 'response')
+
   def __init__(self, pID, gID, name, tier, response):
     self.pID = pID
     self.gID = gID
@@ -35,23 +37,23 @@ def getGiftTable(jsonPath):
     # Iterating through the json list
     for i in data['love']:
         obj.love.append(
-            Giftable(str(i['m_PathID']), -1, '', "love", "")
+            Giftable(i['m_PathID'], -1, '', "love", "")
         )
     for i in data['like']:
         obj.like.append(
-            Giftable(str(i['m_PathID']), -1, '', "like", "")
+            Giftable(i['m_PathID'], -1, '', "like", "")
         )
     for i in data['good']:
         obj.good.append(
-            Giftable(str(i['m_PathID']), -1, '', "good", "")
+            Giftable(i['m_PathID'], -1, '', "good", "")
         )
     for i in data['dislike']:
         obj.dislike.append(
-            Giftable(str(i['m_PathID']), -1, '', "dislike", "")
+            Giftable(i['m_PathID'], -1, '', "dislike", "")
         )
     for i in data['uniqueGifts']:
         obj.unique.append(
-            Giftable(str(i['item']['m_PathID']), -1, '', "unique", i['response'])
+            Giftable(i['item']['m_PathID'], -1, '', "unique", i['response'])
         )
     for i in data['loveResponses']:
         obj.loveResponses.append(i)
@@ -9,6 +9,7 @@ class Item:
         self.pID = ""
         self._gID = ""
         self.description = ""
+        self.helpDescription = ""
 
         self.stackSize = ""
         self.coinSell = ""
@@ -121,6 +122,7 @@ def getItem(jsonPath):
         obj.gID = n[0]
 
     obj.description = data['description']
+    obj.helpDescription = data.get('helpDescription', "")
     obj.stackSize = data['stackSize']
     obj.coinSell = data['sellPrice']
     obj.orbSell = data['orbsSellPrice']
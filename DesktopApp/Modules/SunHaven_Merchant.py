@@ -15,6 +15,8 @@ class Merchant:
         return ret
 
 class Buyable:
+    __slots__ = ('pID', 'gID', 'name', 'value', 'currency', 'amount', 'chance')
+
     def __init__(self, pID, gID, name, value, currency, amount, chance):
         self.pID = pID
         self.gID = gID
@@ -87,7 +89,7 @@ def getMerchant(jsonPath):
         chance = ('chance' in i and i['chance']) or 100
         
         merchant.items.append(
-            Buyable(str(i['item']['m_PathID']), -1, '',
+            Buyable(i['item']['m_PathID'], -1, '',
             str(value), currency, amount, chance)
         )
 
@@ -115,7 +117,7 @@ def getMerchant(jsonPath):
             chance = ('chance' in i and i['chance']) or 100
             
             merchant.items.append(
-                Buyable(str(i['item']['m_PathID']), -1, '',
+                Buyable(i['item']['m_PathID'], -1, '',
                 str(value), currency, amount, chance)
             )
 
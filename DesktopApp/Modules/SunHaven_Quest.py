@@ -72,6 +72,8 @@ class Quest:
         return ret
 
 class Item:
+    __slots__ = ('pID', 'gID', 'name', 'amount')
+
     def __init__(self, pID, gID, name, amount):
         self.pID = pID
         self.gID = gID
@@ -82,6 +84,8 @@ class Item:
         return str(self.amount) + "x " + self.name
 
 class Requirement:
+    __slots__ = ('pID', 'gID', 'name')
+
     def __init__(self, pID, gID, name):
         self.pID = pID
         self.gID = gID
@@ -115,7 +119,7 @@ def getQuest(jsonPath):
     if 'characterProgressRequirements' in data and data['characterProgressRequirements']:
         for i in data['characterProgressRequirements']:
             obj.characterProgressRequirements.append(
-                Requirement(str(i['m_PathID']),-1,'')
+                Requirement(i['m_PathID'],-1,'')
             )
     if 'questProgressRequirements' in data and data['questProgressRequirements']:
         for i in data['questProgressRequirements']:
@@ -125,7 +129,7 @@ def getQuest(jsonPath):
     if 'worldProgressRequirements' in data and data['worldProgressRequirements']:
         for i in data['worldProgressRequirements']:
             obj.worldProgressRequirements.append(
-                Requirement(str(i['m_PathID']),-1,'')
+                Requirement(i['m_PathID'],-1,'')
             )
 
     obj.endText = data['endTex']
@@ -134,7 +138,7 @@ def getQuest(jsonPath):
     for d in data['itemRequirements']:
         for i in d['items']:
             obj.inputs.append(
-                Item(str(i['item']['m_PathID']), -1, '', i['amount'])
+                Item(i['item']['m_PathID'], -1, '', i['amount'])
             )
     # Iterating through the json list
     for i in data['killRequirements']:
@@ -144,17 +148,17 @@ def getQuest(jsonPath):
     # Iterating through the json list
     for i in data['guaranteeRewards']:
         obj.rewards.append(
-            Item(str(i['item']['m_PathID']), -1, '', i['amount'])
+            Item(i['item']['m_PathID'], -1, '', i['amount'])
         )
     # Iterating through the json list
     for i in data['giveItemsOnComplete']:
         obj.rewards.append(
-            Item(str(i['item']['m_PathID']), -1, '', i['amount'])
+            Item(i['item']['m_PathID'], -1, '', i['amount'])
         )
     # Iterating through the json list
     for i in data['choiceRewards']:
         obj.choiceRewards.append(
-            Item(str(i['item']['m_PathID']), -1, '', i['amount'])
+            Item(i['item']['m_PathID'], -1, '', i['amount'])
         )
 
     # Closing file
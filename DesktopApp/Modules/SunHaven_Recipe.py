@@ -60,6 +60,8 @@ class Recipe:
     return "\n".join(result)
 
 class Item:
+  __slots__ = ('pID', 'gID', 'name', 'amount', 'sell_price', 'sell_type')
+
   def __init__(self, pID, gID, name, amount):
     self.pID = pID
     self.gID = gID
@@ -87,29 +89,29 @@ def getRecipe(jsonPath):
     if data['input'] == []:
       for i in data['serializationData']['ReferencedUnityObjects']:
         recipe.inputs.append(
-            Item(str(i['m_PathID']), -1, '', 'x')
+            Item(i['m_PathID'], -1, '', 'x')
         )
     else:
       for i in data['input']:
         recipe.inputs.append(
-            Item(str(i['item']['m_PathID']), -1, '', str(i['amount']))
+            Item(i['item']['m_PathID'], -1, '', str(i['amount']))
         )
       
         
-    recipe.output = Item(str(data['output']['item']['m_PathID']), -1, '',
+    recipe.output = Item(data['output']['item']['m_PathID'], -1, '',
             str(data['output']['amount']))
 
     recipe.craftTime = str(data['hoursToCraft'])
     
     requires = []
     for progress in data['characterProgressTokens']:
-        requires.append(str(progress['m_PathID']))
+        requires.append(progress['m_PathID'])
   
     for progress in data['worldProgressTokens']:
-        requires.append(str(progress['m_PathID']))
+        requires.append(progress['m_PathID'])
   
     for progress in data['questProgressTokens']:
-        requires.append(str(progress['m_PathID']))
+        requires.append(progress['m_PathID'])
         
     for x in set(requires):
         recipe.required_progress.append(Datum(x, -1, ""))
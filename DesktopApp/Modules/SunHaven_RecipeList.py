@@ -7,6 +7,8 @@ class RecipeList:
     self.filename = ""
 
 class Craftable:
+  __slots__ = ('pID', 'gID', 'name')
+
   def __init__(self, pID, gID, name):
     self.pID = pID
     self.gID = gID
@@ -22,7 +24,7 @@ def getRecipeList(jsonPath):
     # Iterating through the json list
     for i in data['craftingRecipes']:
         obj.items.append(
-            Craftable(str(i['m_PathID']), -1, '')
+            Craftable(i['m_PathID'], -1, '')
         )
 
     # Closing file
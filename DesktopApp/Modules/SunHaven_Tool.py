@@ -53,7 +53,7 @@ def getTool(jsonPath):
     obj = Tool()
     
     # Iterating through the json list
-    obj.pID = str(data['m_GameObject']['m_PathID'])
+    obj.pID = data['m_GameObject']['m_PathID']
     obj.isMetalTool = data['_weaponType']
     obj.weaponType = data['_isMetalTool']
 
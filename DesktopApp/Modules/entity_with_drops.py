@@ -5,6 +5,8 @@ from typing import List
 from DesktopApp.datum import Datum
 
 class Drop(Datum):
+    __slots__ = ('dropGroupIndex', 'chance', 'amount', 'percent_chance', 'item_candidates')
+
     def __init__(self, dropGroupIndex, pID, gID, name, chance, amount):
         super().__init__(pID, gID, name)
         self.dropGroupIndex = dropGroupIndex
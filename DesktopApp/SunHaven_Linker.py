@@ -1,9 +1,12 @@
 import os
 import re
-import json
+import csv
 import operator
 import logging
 import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from DesktopApp.Modules import SunHaven_Utilities as utils
 from DesktopApp.Modules import SunHaven_Cutscene as CutsceneParser
@@ -24,37 +27,50 @@ from DesktopApp.Modules import SunHaven_Tool as ToolParser
 from DesktopApp.Modules import SunHaven_Quest as QuestParser
 from DesktopApp.Modules import SunHaven_Book as BookParser
 from DesktopApp.datum import Datum
+from DesktopApp.item_catalog import ItemCatalog
+from DesktopApp.merchant_catalog import MerchantCatalog
 from DesktopApp.parser import Parser
 from DesktopApp.progress import Progress
 from DesktopApp.linker_registry import LinkerRegistry
 
 def jsonParse(parser: Parser, srcPaths, getFunc):
+    return parser.assets_parser.jsonParse(
+        parser.dataPath, 
+        srcPaths, 
+        getFunc, 
+        executor=parser.linkerExecutor(), 
+        cache=parser.object_cache
+    )
+
+def getItemCatalog(parser: Parser) -> ItemCatalog:
+    """
+    Every item file, parsed the same way as the Items linker so they share the object cache.
+    """
+    def build():
+        item_files = [x for x in parser.assets_parser.getMetadata(parser.dstPath) if 'item' in x['tags']]
+        items = jsonParse(parser, [x['filename'] for x in item_files], ItemParser.getItem)
+        logging.debug(f"Cataloged {len(items)} items")
+        return ItemCatalog(items, {os.path.basename(x['filename']) for x in item_files if 'craftable' in x['tags']})
+    
+    return parser.getCatalog("items", build)
+
+def getMerchantCatalog(parser: Parser) -> MerchantCatalog:
+    """
+    Every merchant table, parsed the same way as the Merchants linker so they share the object cache.
+    """
+    def build():
+        merchant_files = [x['filename'] for x in parser.assets_parser.getMetadata(parser.dstPath) if 'merchant table' in x['tags']]
+        merchants = jsonParse(parser, merchant_files, MerchantParser.getMerchant)
+        
+        merchant_datums = []
+        for o in merchants:
+            merchant_datums.extend([x for x in o.items])
+        parser.assets_parser.csvParseAssetFile(merchant_datums)
+        
+        logging.debug(f"Cataloged {len(merchants)} merchants")
+        return MerchantCatalog(merchants)
     
-    def parseFile(fullPath, filename, objList):
-        logging.debug('Loading ' + filename)
-        r = getFunc(fullPath)
-        if r:
-            r.filename = filename
-            objList.append(r)
-
-    objList = []
-    if isinstance(srcPaths, str):
-        srcPaths = [srcPaths]
-
-    for srcPath in srcPaths:
-        folderPath = os.path.join(parser.dataPath, srcPath)
-        if os.path.isdir(folderPath):
-            for filename in os.listdir(folderPath):
-                f = os.path.join(folderPath, filename)
-                if os.path.isfile(f):
-                    parseFile(f,filename,objList)
-        elif os.path.isfile(folderPath):
-            parseFile(folderPath,os.path.basename(srcPath),objList)
-        else:
-            logging.debug('File: ' + folderPath + " cannot be found")
-
-
-    return objList
+    return parser.getCatalog("merchants", build)
 
 @LinkerRegistry.register("Cutscenes")
 def linkCutscenes(parser: Parser, srcPaths, dstPath):
@@ -166,7 +182,7 @@ def linkDialogues(parser, srcPaths, dstPath):
     
     parser.on_progress_update(Progress( f"Finished parsing dialogues..."))
 
-@LinkerRegistry.register("Drop Tables", "drop table")
+@LinkerRegistry.register("Drop Tables", "drop table", requires=["metadata", "assets"])
 def linkDropTables(parser: Parser, srcPaths, dstPath):
 
     objList = jsonParse(parser, srcPaths, DropTableParser.getDropTable)
@@ -189,13 +205,13 @@ def linkDropTables(parser: Parser, srcPaths, dstPath):
     enemies = [obj for obj in objList if isinstance(obj, DropTableParser.Enemy)]
     
     with open(dstPath.replace(".txt", "_formatted.txt"), 'w') as formatted_file:
-        written_tables = []
+        written_tables = set()
         
         enemies.sort(key=lambda x: x.name)
         for key, group in itertools.groupby(enemies, key=lambda x: x.name):
             sorted_levels = [item for item in group]
             sorted_levels.sort(key=lambda x: x.level)
-            written_levels = []
+            written_levels = set()
             result = "{{Tabber"
             
             for dropper in sorted_levels:
@@ -205,15 +221,15 @@ def linkDropTables(parser: Parser, srcPaths, dstPath):
                     result += (f"\n|Level {dropper.level.replace('.0', '')}\n|")
                     result += dropper.to_wiki_format()
                     
-                    written_levels.append(dropper.level)
-                    written_tables.append(dropper)
+                    written_levels.add(dropper.level)
+                    written_tables.add(dropper)
             
             result += "\n}}\n\n"
             formatted_file.write(result)
     
     parser.on_progress_update(Progress( f"Finished parsing drop tables..."))
 
-@LinkerRegistry.register("Destructibles", "destructible")
+@LinkerRegistry.register("Destructibles", "destructible", requires=["metadata", "assets"])
 def linkDestructibles(parser: Parser, srcPaths, dstPath):
 
     objList = jsonParse(parser, srcPaths, DestructibleParser.getDestructible)
@@ -237,7 +253,7 @@ def linkDestructibles(parser: Parser, srcPaths, dstPath):
     
     parser.on_progress_update(Progress( f"Finished parsing destructibles..."))
 
-@LinkerRegistry.register("Seeds", "seed")
+@LinkerRegistry.register("Seeds", "seed", requires=["metadata", "assets", "merchants"])
 def linkSeeds(parser: Parser, srcPaths, dstPath):
     
     objList = jsonParse(parser, srcPaths, SeedParser.getSeed)
@@ -245,25 +261,15 @@ def linkSeeds(parser: Parser, srcPaths, dstPath):
     parser.on_progress_update(Progress( f"Found {str(len(objList))} seeds."))
 
     parser.on_progress_update(Progress( f"Getting seed prices..."))
-    all_files = parser.assets_parser.csvParseMetadataFile(parser.dstPath)
-    merchant_lists = [x['filename'] for x in all_files if 'merchant table' in x['tags'] and \
-        ("General" in x['filename'] or "Farming" in x['filename'] or "Seeds" in x['filename'])]
-    
-    merchants = jsonParse(parser, merchant_lists, MerchantParser.getMerchant)
-    merchant_datums = []
-    for o in merchants:
-        merchant_datums.extend([x for x in o.items])
-    parser.assets_parser.csvParseAssetFile(merchant_datums)
+    merchant_catalog = getMerchantCatalog(parser)
     
-    merchant_items = []
-    for merchant in merchants:
-        for item in merchant.items:
-            merchant_items.append(item)
+    def sellsSeeds(merchant):
+        return "General" in merchant or "Farming" in merchant or "Seeds" in merchant
     
     for seed in objList:
-        matching_item = [item for item in merchant_items if item.name == seed.name]
-        if matching_item:
-            seed.buy_price = int(matching_item[0].value)
+        offers = merchant_catalog.offers(seed.name, sellsSeeds)
+        if offers:
+            seed.buy_price = int(offers[0].value)
     
     parser.on_progress_update(Progress( f"Writing seeds to file..."))
 
@@ -282,7 +288,7 @@ def linkSeeds(parser: Parser, srcPaths, dstPath):
     
     parser.on_progress_update(Progress( f"Finished parsing seeds..."))
 
-@LinkerRegistry.register("Animals", "animal")
+@LinkerRegistry.register("Animals", "animal", requires=["metadata", "assets"])
 def linkAnimals(parser: Parser, srcPaths, dstPath):
     animals = jsonParse(parser, srcPaths, AnimalsParser.getAnimalTable)
     logging.debug("Found " + str(len(animals)) + " animals.")
@@ -310,7 +316,7 @@ def linkAnimals(parser: Parser, srcPaths, dstPath):
     
     parser.on_progress_update(Progress( f"Finished parsing animals..."))
 
-@LinkerRegistry.register("Items", 'item')
+@LinkerRegistry.register("Items", 'item', requires=["metadata"])
 def linkItems(parser, srcPaths, dstPath):
 
     objList = jsonParse(parser, srcPaths, ItemParser.getItem)
@@ -327,7 +333,7 @@ def linkItems(parser, srcPaths, dstPath):
     
     parser.on_progress_update(Progress( f"Finished parsing items..."))
 
-@LinkerRegistry.register("Fishing Nets", "fish net")
+@LinkerRegistry.register("Fishing Nets", "fish net", requires=["metadata", "assets"])
 def linkFishingNets(parser: Parser, srcPaths, dstPath):
     
     objList = jsonParse(parser, srcPaths, FishingNetParser.getFishingNet)
@@ -349,7 +355,7 @@ def linkFishingNets(parser: Parser, srcPaths, dstPath):
             fishing_net_file.write('\n')
     parser.on_progress_update(Progress( f"Finished writing fishing nets..."))
 
-@LinkerRegistry.register("Fish Spawners", "fish spawner")
+@LinkerRegistry.register("Fish Spawners", "fish spawner", requires=["metadata", "assets", "fish spawners", "items"])
 def linkFishSpawners(parser: Parser, srcPaths, dstPath):
     
     objList = jsonParse(parser, srcPaths, FishSpawnerParser.getFishSpawner)
@@ -362,85 +368,29 @@ def linkFishSpawners(parser: Parser, srcPaths, dstPath):
     parser.on_progress_update(Progress(f"Writing fish spawners to file..."))
     
     # Get somewhat usable names of fish spawners
-    spawner_refs = []
-    
-    with open(parser.assets_parser.references_path, 'r') as ref_file:
-        for line in ref_file.readlines():
-            pieces = line.split(",")
-            if re.match("[A-Za-z]+FishSpawner.*", pieces[2]) is not None:
-                spawner_refs.append(Datum(pieces[0], pieces[1], pieces[2].replace("FishSpawner", "")))
-                
+    spawner_locations = parser.getFishSpawnerLocations()
     for spawner in objList:
-        ref = [x for x in spawner_refs if str(x.pID) == str(spawner.location.pID)]
-        if ref:
-            spawner.location = ref[0]
-
-    # Convert list into a Set containing only unique values
-    objSet = []
-    objSet.append(objList[0])
-    for oList in objList:
-        hasSame = False
-        for oSet in objSet:
-            # If the drops length differs, they are not the same
-            if len(oList.drops) == len(oSet.drops):
-                # Check each drop, if any is different, the drops are different
-                for idx in range(len(oList.drops)):
-                    if oList.drops[idx].name != oSet.drops[idx].name:
-                        break
-                    elif oList.drops[idx].chance != oSet.drops[idx].chance:
-                        break
-                else:
-                    hasSame = True
+        entry = spawner_locations.get(spawner.location.pID)
+        if entry is not None:
+            spawner.location = Datum(spawner.location.pID, entry[0], entry[1])
 
-            if hasSame:
-                break
-        else:
-            objSet.append(oList)
-    logging.debug(len(objSet))
+    # Group spawners by their fish table, keeping the first one seen for each
+    tables = {}
+    for spawner in objList:
+        tables.setdefault(spawner.signature(), []).append(spawner)
+    objSet = [spawners[0] for spawners in tables.values()]
+    logging.debug(f"{len(objSet)} unique fish tables across {len(objList)} spawners")
     
     parser.on_progress_update(Progress("Calculating fish spawn percentages..."))
     
-    rarities = {}
+    item_catalog = getItemCatalog(parser)
     
     logging.debug("Getting fish rarities to calculate spawn % chance")
     for spawn in objSet:
         logging.debug(f"Calculating spawner {spawn.filename}")
         
-        # Find item to get rarity
         for fish in [x for x in spawn.drops if x.name]:
-            if fish.name in rarities.keys():
-                fish.rarity = rarities[fish.name]
-                continue
-            
-            relevant_files = []
-            with open(parser.dstPath, 'r') as file_types:
-                relevant_files = [line for line in file_types.readlines() if fish.name in line and "item,craftable" in line]
-            
-            for file in relevant_files:
-                try:
-                    with open(os.path.join(parser.dataPath, file.split(',')[0].rstrip()), 'r') as data_file:
-                        data = json.load(data_file)
-                        if data["name"] != fish.name:
-                            continue
-                        else:
-                            rarity = int(data["rarity"])
-                            if rarity == 0:
-                                fish.rarity = "Common"
-                            elif rarity == 1:
-                                fish.rarity = "Uncommon"
-                            elif rarity == 2:
-                                fish.rarity = "Rare"
-                            elif rarity == 3:
-                                fish.rarity = "Epic"
-                            elif rarity == 4:
-                                fish.rarity = "Legendary"
-                            
-                            rarities[fish.name] = fish.rarity
-                            break
-                        
-                except FileNotFoundError:
-                    logging.warning(f"Couldn't find file {file} while looking for {fish.name}")
-            
+            fish.rarity = item_catalog.rarity(fish.name, fish.rarity)
             
         spawn.calculate_percent_chance()
 
@@ -451,6 +401,38 @@ def linkFishSpawners(parser: Parser, srcPaths, dstPath):
         f.write(f"{obj}\n\n")
         
     f.close()
+    with open(f"{dstPath.split('.txt')[0]}_SharedTables.txt", "w") as shared_file:
+        for spawners in tables.values():
+            locations = [x.location.name.rstrip() or x.filename for x in spawners]
+            shared_file.write(f"{spawners[0].filename}: {len(spawners)} location(s)\n")
+            for location in locations:
+                shared_file.write(f"    {location}\n")
+            shared_file.write("\n")
+        
+    parser.on_progress_update(Progress("Calculating fish catch curves..."))
+    
+    # Every level, with and without maxed Familiar Waters and Advanced Fish Mapping
+    levels = range(1, FishSpawnerParser.maxLevel + 1)
+    familiar_waters_values = [0, 15]
+    advanced_fish_mapping_values = [0, 30]
+    
+    with open(f"{dstPath.split('.txt')[0]}_CatchCurves.csv", "w", newline='') as curves_file:
+        writer = csv.writer(curves_file)
+        writer.writerow(["spawner", "location", "season", "fish", "rarity", "familiar_waters", "advanced_fish_mapping"] + [f"level {x}" for x in levels])
+        
+        for spawner in objSet:
+            table = spawner.catch_table(levels, familiar_waters_values, advanced_fish_mapping_values)
+            location = spawner.location.name.rstrip()
+            
+            for season in FishSpawnerParser.seasons:
+                seasonal_drops = [drop for drop in spawner.drops if drop.season == season]
+                
+                for index, fish in enumerate(seasonal_drops):
+                    for familiar_waters in familiar_waters_values:
+                        for advanced_fish_mapping in advanced_fish_mapping_values:
+                            curve = [round(table[season][(level, familiar_waters, advanced_fish_mapping)][index], 2) for level in levels]
+                            writer.writerow([spawner.filename, location, season, fish.name, fish.rarity, familiar_waters, advanced_fish_mapping] + curve)
+        
     parser.on_progress_update(Progress(f"Sorting and writing to another file..."))
     
     sorted_fish = []
@@ -530,7 +512,7 @@ def linkFishSpawners(parser: Parser, srcPaths, dstPath):
             
     parser.on_progress_update(Progress(f"Finished writing fish spawners to file..."))    
 
-@LinkerRegistry.register("Gift Tables", "gift table")
+@LinkerRegistry.register("Gift Tables", "gift table", requires=["metadata", "assets"])
 def linkGiftTables(parser: Parser, srcPaths, dstPath):
     objList = jsonParse(parser, srcPaths, GiftTableParser.getGiftTable)
     logging.debug("Found " + str(len(objList)) + " Gift Tables.")
@@ -586,7 +568,7 @@ def linkGiftTables(parser: Parser, srcPaths, dstPath):
     f.close()
     parser.on_progress_update(Progress( f"Finished writing gift tables to file..."))
 
-@LinkerRegistry.register("Merchants", "merchant table")
+@LinkerRegistry.register("Merchants", "merchant table", requires=["metadata", "assets"])
 def linkMerchants(parser: Parser, srcPaths, dstPath):
 
     objList = jsonParse(parser, srcPaths, MerchantParser.getMerchant)
@@ -616,7 +598,7 @@ def linkMerchants(parser: Parser, srcPaths, dstPath):
                 formatted_file.write("\n{{Shop|" + f"{item.name}|{item.value}|{item.currency}" + "}}")
             formatted_file.write("\n{{Shop/footer}}\n")
 
-@LinkerRegistry.register("Nested Recipe Lists", "recipe list")
+@LinkerRegistry.register("Nested Recipe Lists", "recipe list", requires=["metadata", "assets", "references"])
 def linkNestedRecipeLists(parser: Parser, srcPaths, dstPath):
     recipe_lists = jsonParse(parser, srcPaths, RecipeListParser.getRecipeList)
     logging.debug("Found " + str(len(recipe_lists)) + " Recipe Lists.")
@@ -628,61 +610,81 @@ def linkNestedRecipeLists(parser: Parser, srcPaths, dstPath):
         recipe_list_datum.extend([x for x in o.items])
     parser.assets_parser.csvParseAssetFile(recipe_list_datum)
     
-    recipe_paths = [x['filename'] for x in parser.assets_parser.csvParseMetadataFile(parser.dstPath) if 'recipe' in x['tags'] and '#' not in x['filename']]
+    recipe_paths = [x['filename'] for x in parser.assets_parser.getMetadata(parser.dstPath) if 'recipe' in x['tags'] and '#' not in x['filename']]
     recipes = jsonParse(parser, recipe_paths, RecipeParser.getRecipe)
     logging.debug("Found " + str(len(recipes)) + " Recipes.")
     parser.on_progress_update(Progress( f"Found " + str(len(recipes)) + " Recipes."))
 
     recipe_datum = []
-    recipe_refs_datum = []
     recipe_datum.extend([x.output for x in recipes])
     for rec in recipes:
         recipe_datum.extend([x for x in rec.inputs])
-        recipe_refs_datum.extend([x for x in rec.required_progress])
         
     parser.assets_parser.csvParseAssetFile(recipe_datum)
-    refs = parser.assets_parser.csvParseReferenceFile(recipe_refs_datum)
-
+    
+    def resolveProgress(recipe):
+        recipe_progress = []
+        for progress in recipe.required_progress:
+            ref = parser.assets_parser.findReference(progress.pID)
+            recipe_progress.append(ref if ref is not None else progress)
+        recipe.required_progress = recipe_progress
+
+    # One pass over the recipes, indexing them by name and picking out the jam recipes
+    # Jam Maker doesn't have a recipe list ?????!!!?
+    # Grabbing all recipes that have the word "Jam", avoiding things like "Jam Shed" and "Jam Maker"
+    recipes_by_name = {}
+    jam_recipes = []
+    for index, recipe in enumerate(recipes):
+        recipes_by_name.setdefault(str(recipe.name), []).append(index)
+        if "Jam" in str(recipe.name) and not str(recipe.name).startswith("Jam"):
+            jam_recipes.append(recipe)
+    
+    # Workbench -> the recipes it crafts, in the same order as the recipes were found
+    workbench_recipes = []
+    for workbench in recipe_lists:
+        indexes = set()
+        for name in {str(x.name) for x in workbench.items}:
+            indexes.update(recipes_by_name.get(name, []))
+        
+        workbench_name = workbench.filename
+        workbench_name = re.sub(r'.*RecipeList_', '', workbench_name)
+        workbench_name = re.sub(r'(#[0-9]+)*\.json', '', workbench_name)
+        workbench_name = workbench_name.replace("RecipeList _", "")
+        
+        workbench_recipes.append((workbench, workbench_name, [recipes[x] for x in sorted(indexes)]))
+    
     parser.on_progress_update(Progress( f"Writing recipes to file..."))
     os.makedirs(os.path.dirname(dstPath), exist_ok=True)
     with open(dstPath.replace(".txt", "_formatted.txt"), "w") as formatted_file:
-        for workbench in recipe_lists:
-            matching_recipes = [r for r in recipes if str(r.name) in [str(x.name) for x in workbench.items]]
+        for workbench, workbench_name, matching_recipes in workbench_recipes:
             logging.debug(f"Getting recipes for {workbench.filename} (found {len(matching_recipes)}/{len(workbench.items)} recipes)")
             for recipe in matching_recipes:
-                workbench_name = workbench.filename
-                workbench_name = re.sub(r'.*RecipeList_', '', workbench_name)
-                workbench_name = re.sub(r'(#[0-9]+)*\.json', '', workbench_name)
-                
-                recipe.workbench = workbench_name.replace("RecipeList _", "")
-                
-                recipe_progress = []
-                for progress in recipe.required_progress:
-                    ref = [x for x in refs if progress.pID == x.pID][0]
-                    recipe_progress.append(ref)
-                recipe.required_progress = recipe_progress
+                recipe.workbench = workbench_name
+                resolveProgress(recipe)
                 
                 logging.debug(f"\twriting {recipe.name}")
                 formatted_file.write(recipe.to_wiki_format())
             
         logging.debug("Getting Jam Recipes...")
-        # Jam Maker doesn't have a recipe list ?????!!!?
-        # Grabbing all recipes that have the word "Jam", avoiding things like "Jam Shed" and "Jam Maker"
-        for recipe in [r for r in recipes if "Jam" in str(r.name) and not str(r.name).startswith("Jam")]:
+        for recipe in jam_recipes:
                 recipe.workbench = "Jam Maker"
-                
-                recipe_progress = []
-                for progress in recipe.required_progress:
-                    ref = [x for x in refs if progress.pID == x.pID][0]
-                    recipe_progress.append(ref)
-                recipe.required_progress = recipe_progress
+                resolveProgress(recipe)
                 
                 logging.debug(f"\twriting {recipe.name}")
                 formatted_file.write(recipe.to_wiki_format())
+    
+    with open(dstPath.replace(".txt", "_WorkbenchIndex.csv"), "w", newline='') as index_file:
+        writer = csv.writer(index_file)
+        writer.writerow(["workbench", "workbench_file", "recipe", "recipe_file"])
+        for workbench, workbench_name, matching_recipes in workbench_recipes:
+            for recipe in matching_recipes:
+                writer.writerow([workbench_name, workbench.filename, recipe.name, recipe.filename])
+        for recipe in jam_recipes:
+            writer.writerow(["Jam Maker", "", recipe.name, recipe.filename])
 
     parser.on_progress_update(Progress( f"Finished recipes to file..."))
 
-@LinkerRegistry.register("Recipe Lists", "recipe list")
+@LinkerRegistry.register("Recipe Lists", "recipe list", requires=["metadata", "assets"])
 def linkRecipeLists(parser: Parser, srcPaths, dstPath):
     objList = jsonParse(parser, srcPaths, RecipeListParser.getRecipeList)
     logging.debug("Found " + str(len(objList)) + " Recipe Lists.")
@@ -707,7 +709,7 @@ def linkRecipeLists(parser: Parser, srcPaths, dstPath):
     parser.on_progress_update(Progress( f"Finished writing recipe lists to file..."))
 
 
-@LinkerRegistry.register("Recipes", "recipe")
+@LinkerRegistry.register("Recipes", "recipe", requires=["metadata", "assets", "items"])
 def linkRecipes(parser: Parser, srcPaths, dstPath):
             
     objList = jsonParse(parser, srcPaths, RecipeParser.getRecipe)
@@ -724,6 +726,8 @@ def linkRecipes(parser: Parser, srcPaths, dstPath):
     datumList.extend([x.workbench for x in objList if x.workbench is not None])
     parser.assets_parser.csvParseAssetFile(datumList)
 
+    item_catalog = getItemCatalog(parser)
+
     parser.on_progress_update(Progress( f"Writing recipes to file..."))
     os.makedirs(os.path.dirname(dstPath), exist_ok=True)
     f = open(dstPath, "w")
@@ -731,25 +735,17 @@ def linkRecipes(parser: Parser, srcPaths, dstPath):
     for recipe in objList:
         f.write(recipe.filename+'\n')
 
-        if recipe.output.gID and recipe.output.name:
-            if parser.gameVersion == "230405":
-                jPath = os.path.join(parser.dataPath,'_Monobehaviour/Item', recipe.output.gID +' - '+ recipe.output.name + '.json')
-            else:
-                jPath = os.path.join(parser.dataPath,'Monobehaviour', recipe.output.gID+' - '+recipe.output.name+'.json')
-
-            if os.path.isfile(jPath):
-                j = open(jPath)
-                data = json.load(j)
-                f.write(': ' + data['description'] + '\n: ' + data['helpDescription']+'\n')
-                recipe.output.sell_price = data['sellPrice']
-                recipe.output.sell_type = "Coins"
-                if data['orbsSellPrice'] > 0:
-                    recipe.output.sell_price = data['orbsSellPrice']
-                    recipe.output.sell_type = "Orbs"
-                if data['ticketSellPrice'] > 0:
-                    recipe.output.sell_price = data['ticketSellPrice']
-                    recipe.output.sell_type = "Tickets"
-                j.close()
+        output_item = item_catalog.get(recipe.output.gID) if recipe.output.gID and recipe.output.name else None
+        if output_item is not None:
+            f.write(': ' + output_item.description + '\n: ' + output_item.helpDescription+'\n')
+            recipe.output.sell_price = output_item.coinSell
+            recipe.output.sell_type = "Coins"
+            if output_item.orbSell > 0:
+                recipe.output.sell_price = output_item.orbSell
+                recipe.output.sell_type = "Orbs"
+            if output_item.ticketSell > 0:
+                recipe.output.sell_price = output_item.ticketSell
+                recipe.output.sell_type = "Tickets"
         
         f.write('Crafting Time: '+recipe.craftTime+'\nInputs:\n')
         for item in recipe.inputs:
@@ -791,7 +787,7 @@ def linkStattedItems(parser, srcPaths, dstPath):
     f.close()
     parser.on_progress_update(Progress( f"Finished writing statted items..."))
 
-@LinkerRegistry.register("Tools")
+@LinkerRegistry.register("Tools", requires=["assets"])
 def linkTools(parser: Parser, srcPaths, dstPath):
     objList = jsonParse(parser, srcPaths, ToolParser.getTool)
     logging.debug(f"Found {str(len(objList))} Tools.")
@@ -814,7 +810,7 @@ def linkTools(parser: Parser, srcPaths, dstPath):
     
     parser.on_progress_update(Progress( f"Finished writing tools file..."))
 
-@LinkerRegistry.register("Books", "readable")
+@LinkerRegistry.register("Books", "readable", requires=["metadata"])
 def linkBooks(parser: Parser, srcPaths, dstPath):
     books = jsonParse(parser, srcPaths, BookParser.getBook)
     logging.debug(f"Found {str(len(books))} Books.")
@@ -833,7 +829,7 @@ def linkBooks(parser: Parser, srcPaths, dstPath):
     
     parser.on_progress_update(Progress( f"Finished writing books file..."))
     
-@LinkerRegistry.register("Quests", 'quest')
+@LinkerRegistry.register("Quests", 'quest', requires=["metadata", "assets"])
 def linkQuests(parser: Parser, srcPaths, dstPath):
 
     objList = jsonParse(parser, srcPaths, QuestParser.getQuest)
@@ -858,15 +854,69 @@ def linkQuests(parser: Parser, srcPaths, dstPath):
     parser.on_progress_update(Progress( f"Finished writing quests file..."))
 
 def start_linking(parser: Parser, enabled_linkers):
-    linkers = LinkerRegistry.linkers
-    all_files = parser.assets_parser.csvParseMetadataFile(parser.dstPath)
+    try:
+        link_all(parser, enabled_linkers)
+    finally:
+        parser.shutdownExecutor()
+        parser.assets_parser.clearIndexes()
+
+# Shared data linkers can ask for, each is loaded once before any linker that needs it starts
+linkerResources = {
+    "metadata": lambda parser: parser.assets_parser.getMetadata(parser.dstPath),
+    "assets": lambda parser: parser.assets_parser.getIndex(parser.csvPath, "assets"),
+    "references": lambda parser: parser.assets_parser.getIndex(parser.refPath, "references"),
+    "fish spawners": lambda parser: parser.getFishSpawnerLocations(),
+    "items": getItemCatalog,
+    "merchants": getMerchantCatalog,
+}
+
+def link_all(parser: Parser, enabled_linkers):
+    """
+    Runs every enabled linker, starting each one as soon as everything it requires is ready.
+    Linkers that don't depend on each other run at the same time on parser.linker_workers threads.
+    """
+    linkers = [linker for linker in LinkerRegistry.linkers if linker.label in enabled_linkers]
+    labels = [linker.label for linker in linkers]
+    
+    resources = []
+    waiting_on = {}
+    for linker in linkers:
+        waiting_on[linker.label] = set()
+        for requirement in linker.requires:
+            if requirement in linkerResources:
+                waiting_on[linker.label].add(requirement)
+                if requirement not in resources:
+                    resources.append(requirement)
+            elif requirement in labels:
+                waiting_on[linker.label].add(requirement)
+            elif not any(x.label == requirement for x in LinkerRegistry.linkers):
+                raise ValueError(f"{linker.label} requires unknown linker or resource: {requirement}")
+    
+    succeeded = set()
+    failed = set()
+    for resource in resources:
+        try:
+            logging.debug(f"Loading {resource} for linkers")
+            linkerResources[resource](parser)
+            succeeded.add(resource)
+        except Exception as e:
+            failed.add(resource)
+            parser.on_progress_update(Progress(f"Error when loading {resource}", error=e))
+            logging.error(f"Error when loading {resource}", exc_info=True)
+    
+    all_files = parser.assets_parser.getMetadata(parser.dstPath) if "metadata" in succeeded else []
     
     progress = 0
+    progress_lock = threading.Lock()
     
-    for linker in linkers:
-        files = []
+    def run(linker):
+        nonlocal progress
         
-        if linker.label in enabled_linkers:
+        try:
+            tic = time.perf_counter()
+            logging.debug(f"Started linking {linker.label}")
+            
+            files = []
             # TODO: there's gotta be a better way
             if linker.tag is None:
                 if linker.label == "Cutscenes": 
@@ -875,14 +925,51 @@ def start_linking(parser: Parser, enabled_linkers):
                     files = 'TextAsset'
             else:
                 files = [x['filename'] for x in all_files if (linker.tag in x['tags'])]
-            try:
-                linker.callable(parser, files, os.path.join(parser.outputPath, parser.gameVersion, linker.output_filename))
+            
+            linker.callable(parser, files, os.path.join(parser.outputPath, parser.gameVersion, linker.output_filename))
+            
+            with progress_lock:
                 progress += 1
-                parser.on_progress_update(Progress(f"Finished linking {linker.label}", current_progress=progress, max_progress=len(enabled_linkers)))
-            except Exception as e:
-                parser.on_progress_update(Progress(f"Error when linking {linker.label}", error=e))
-                logging.error(f"Error when linking {linker.label}", exc_info=True)
+                current_progress = progress
+            parser.on_progress_update(Progress(f"Finished linking {linker.label}", current_progress=current_progress, max_progress=len(enabled_linkers)))
+            logging.debug(f"Linked {linker.label} in {time.perf_counter() - tic:0.4f} seconds")
+            logging.debug(f"Object cache after {linker.label}: {parser.object_cache}")
+            return True
+        except Exception as e:
+            parser.on_progress_update(Progress(f"Error when linking {linker.label}", error=e))
+            logging.error(f"Error when linking {linker.label}", exc_info=True)
+            return False
+    
+    workers = parser.linker_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        pending = list(linkers)
+        
+        while pending or running:
+            # Start everything whose requirements have finished, in registration order
+            for linker in list(pending):
+                if waiting_on[linker.label] & failed:
+                    pending.remove(linker)
+                    failed.add(linker.label)
+                    parser.on_progress_update(Progress(f"Skipped {linker.label}, something it needs failed"))
+                    logging.error(f"Skipped {linker.label}, it requires {waiting_on[linker.label] & failed}")
+                elif waiting_on[linker.label] <= succeeded:
+                    pending.remove(linker)
+                    running[executor.submit(run, linker)] = linker
             
+            if not running:
+                if pending:
+                    raise ValueError(f"Linkers require each other: {[linker.label for linker in pending]}")
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                linker = running.pop(future)
+                if future.result():
+                    succeeded.add(linker.label)
+                else:
+                    failed.add(linker.label)
 
+    logging.debug(f"Object cache: {parser.object_cache}")
     parser.on_progress_update(Progress(f"Finished!", complete=True))
     logging.debug('Done!')
@@ -1,159 +1,32 @@
 # import required module
 import os
+import csv
 import shutil
 import logging
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
-def isRecipe(f):
-    return 'Recipe ' in f
-def isTool(f):
-    return f.startswith('Axe') or \
-            f.startswith('Pickaxe') or \
-            f.startswith('Hoe') or \
-            f.startswith('Sword') or \
-            f.startswith('WateringCan') or \
-            f.startswith('CrossBow') or \
-            f.startswith('FishingRod')
-def isRecipeList(f):
-    return f.startswith('RecipeList')
-def isWhistle(f):
-    return 'Whistle' in f
-def isRecord(f):
-    return 'Record' in f
-def isMerchant(f):
-    return ('MerchantTable.json' in f)
-def isNPC(f):
-    return ('WalkCycle' in f) or \
-        f.endswith('WalkPath.json') or \
-        ('PathA' in f) or \
-        ('PathB' in f) or \
-        ('PathRain' in f)
-def isCutscene(f):
-    return ('Cutscene' in f)
-def isWaterEdgeTile(f):
-    return ('water_edge_tiles' in f) or f.startswith('Side_of_Water_Tiles')
-def isSceneSetting(f):
-    return ('SceneSettings' in f)
-def isQuest(f):
-    return ('Quest.json' in f)
-def isMail(f):
-    return ('Mail' in f)
-def isGiftTable(f):
-    return ('GiftTable.json' in f)
-def isRecurringChest(f):
-    return f.startswith('RecurringChest')
-def isDebugUIHandler(f):
-    return f.startswith('DebugUIHandler')
-def isPerk(f):
-    return (f.startswith('Combat') and f[6].isnumeric()) or \
-        (f.startswith('Exploration') and f[11].isnumeric()) or \
-        (f.startswith('Farming') and f[7].isnumeric()) or \
-        (f.startswith('Fishing') and f[7].isnumeric()) or \
-        (f.startswith('Mining') and f[6].isnumeric())
-def isSkillLevelReward(f):
-    return (f.startswith('CombatLevel') and f[11].isnumeric()) or \
-        (f.startswith('ExplorationLevel') and f[16].isnumeric()) or \
-        (f.startswith('FarmingLevel') and f[12].isnumeric()) or \
-        (f.startswith('FishingLevel') and f[12].isnumeric()) or \
-        (f.startswith('MiningLevel') and f[11].isnumeric())
-def isHardware(f):
-    return f.startswith('3D') or \
-        f.startswith('8Bitdo') or \
-        f.startswith('Buffalo') or \
-        f.startswith('CHFighter') or \
-        f.startswith('CHPro') or \
-        f.startswith('CHThrottle') or \
-        f.startswith('Logitech') or \
-        f.startswith('Microsoft') or \
-        f.startswith('Nintendo') or \
-        f.startswith('OpenVR') or \
-        f.startswith('Saitek') or \
-        f.startswith('Samsung') or \
-        f.startswith('Sony') or \
-        f.startswith('Thrustmaster') or \
-        f.startswith('ThrustMaster') or \
-        f.startswith('XiaoMi') or \
-        f.startswith('XInput') or \
-        f.startswith('Zhidong')
-def isGoldenPom(f):
-    return f.startswith('GoldenPom')
-def isMuseum(f):
-    return f.startswith('MuseumAquarium') or \
-        ('AlchemyBundle' in f) or \
-        ('CropsBundle' in f) or \
-        ('ExplorationBundle' in f) or \
-        ('FarmingBundle' in f) or \
-        ('FishingBundle' in f) or \
-        ('ForagingBundle' in f) or \
-        ('GemBundle' in f) or \
-        ('ManaBundle' in f) or \
-        ('MinesBundle' in f) or \
-        ('MoneyBundle' in f)
+from DesktopApp.prefix_trie import PrefixTrie
 
-def isWithergateTile(f):
-    return f.startswith('Withergate_cliff_tiles') or \
-           f.startswith('withergate_tiles') or \
-           f.startswith('Withergate_tiles') or \
-           f.startswith('WithergateRoadTiles') or \
-           f.startswith('withergatefarm_tiles') or \
-           f.startswith('wg_rooftop_farm_dirtbase') or \
-           f.startswith('Dynus_dirtroad_tiles') or \
-           f.startswith('Sewer_clifs') or \
-           f.startswith('Sewer_pier_tiles') or \
-           f.startswith('Withergate_farming_roof_') or \
-           f.startswith('Dragon_meet_tiles') or \
-           f.startswith('throne_room_floor') or \
-           f.startswith('WithergateThroneRoomBorderTiles')
-def isNelvariTile(f):
-    return f.startswith('elven_dirt_road_') or \
-           f.startswith('Elventiles_') or \
-           f.startswith('Nivara_Tiles') or \
-           f.startswith('nelvarifarm_tiles') or \
-           f.startswith('nelvari_jumpspot_tiles') or \
-           f.startswith('purple_rooftiles') or \
-           f.startswith('purple_tile_herb')
-def isSunhavenTile(f):
-    return f.startswith('beach_tiles') or \
-           f.startswith('Beach_pier_tiles') or \
-           f.startswith('barn_floor_tiles') or \
-           f.startswith('farm_dirt') or \
-           f.startswith('Farm_dirt') or \
-           f.startswith('farm_tiles') or \
-           f.startswith('Grass_Patches_') or \
-           f.startswith('Ho_and_water_') or \
-           f.startswith('HumanClifTiles_') or \
-           f.startswith('Sunhaven_Tiles') or \
-           f.startswith('SunhavenSidewalk') or \
-           f.startswith('town_tile_edits') or \
-           f.startswith('Woodcutting_Forest_Grass_Tiles') or \
-           f.startswith('ceilingtilestest') or \
-           f.startswith('Forest_tileset') or \
-           f.startswith('Hexagon town center') or \
-           f.startswith('SunHaven_Town_Center_') or \
-           f.startswith('WornhardtTiles')
-def isFloorTile(f):
-    return f.startswith('floor_') or \
-        f.startswith('Floortile_') or \
-        f.startswith('grey_large_tile') or \
-        f.startswith('Gum_tiles')
+toolPrefixes = ['Axe', 'Pickaxe', 'Hoe', 'Sword', 'WateringCan', 'CrossBow', 'FishingRod']
+npcSubstrings = ['WalkCycle', 'PathA', 'PathB', 'PathRain']
+perkPrefixes = ['Combat', 'Exploration', 'Farming', 'Fishing', 'Mining']
+skillLevelPrefixes = ['CombatLevel', 'ExplorationLevel', 'FarmingLevel', 'FishingLevel', 'MiningLevel']
+hardwarePrefixes = ['3D', '8Bitdo', 'Buffalo', 'CHFighter', 'CHPro', 'CHThrottle', 'Logitech', 'Microsoft', 'Nintendo', 'OpenVR', \
+                    'Saitek', 'Samsung', 'Sony', 'Thrustmaster', 'ThrustMaster', 'XiaoMi', 'XInput', 'Zhidong']
+museumBundles = ['AlchemyBundle', 'CropsBundle', 'ExplorationBundle', 'FarmingBundle', 'FishingBundle', 'ForagingBundle', 'GemBundle', \
+                 'ManaBundle', 'MinesBundle', 'MoneyBundle']
+withergateTilePrefixes = ['Withergate_cliff_tiles', 'withergate_tiles', 'Withergate_tiles', 'WithergateRoadTiles', 'withergatefarm_tiles', \
+                          'wg_rooftop_farm_dirtbase', 'Dynus_dirtroad_tiles', 'Sewer_clifs', 'Sewer_pier_tiles', 'Withergate_farming_roof_', \
+                          'Dragon_meet_tiles', 'throne_room_floor', 'WithergateThroneRoomBorderTiles']
+nelvariTilePrefixes = ['elven_dirt_road_', 'Elventiles_', 'Nivara_Tiles', 'nelvarifarm_tiles', 'nelvari_jumpspot_tiles', 'purple_rooftiles', \
+                       'purple_tile_herb']
+sunhavenTilePrefixes = ['beach_tiles', 'Beach_pier_tiles', 'barn_floor_tiles', 'farm_dirt', 'Farm_dirt', 'farm_tiles', 'Grass_Patches_', \
+                        'Ho_and_water_', 'HumanClifTiles_', 'Sunhaven_Tiles', 'SunhavenSidewalk', 'town_tile_edits', \
+                        'Woodcutting_Forest_Grass_Tiles', 'ceilingtilestest', 'Forest_tileset', 'Hexagon town center', \
+                        'SunHaven_Town_Center_', 'WornhardtTiles']
+floorTilePrefixes = ['floor_', 'Floortile_', 'grey_large_tile', 'Gum_tiles']
 
-def isCharCustomization(f):
-    for i in charCustomizationTags:
-        if f.startswith(i):
-            return True
-    return False
-def isClothes(f):
-    for i in clothingTags:
-        if f.startswith(i):
-            return True
-    return (f.startswith('chest') and f[5].isnumeric())
- 
-def isLargeDatatype(f, datatype):
-    return f.startswith(datatype+' #') or (f == datatype+'.json')
-def isItem(f):
-    return f[0].isnumeric() and f[1].isnumeric() and f[2].isnumeric()
-
-def isFile(f):
-    return os.path.isfile(f)
 def isFolder(f):
     return os.path.isdir(f)
 
@@ -205,80 +78,280 @@ charCustomizationTags = ['AmariCat_', 'amari_bird_chest', 'amari_cat_chest', 'am
                         'Hair_', 'halo3_', 'horns_amari_', 'horns_demon_', 'mask_elf', 'naga_', 'nagas_fix_', 'tail_', 'wing_bird_', 'wings_', \
                         'silver_feather_', 'slash_chest_', 'warcaster', 'wrap_dress']
 
-def Clean(srcFolder, dstFolder):
+def _numberedPrefixes(prefixes, digits=1):
+    """
+    Every prefix followed by digits ascii digits, for the rules that check f[n].isnumeric().
+    """
+    for _ in range(digits):
+        prefixes = [prefix + digit for prefix in prefixes for digit in '0123456789']
+    return prefixes
+
+class FileClassifier:
+    """
+    Works out which folder a MonoBehaviour file is cleaned into.
+    
+    Rules are added in the order they're checked, and the first one that matches wins. 
+    Prefixes and exact names are all looked up with one walk down a trie, however many 
+    there are, so only the handful of rules that look inside the name are checked one by one,
+    and only those that come before the trie's match.
+    """
+    def __init__(self):
+        self.prefixes = PrefixTrie()
+        self.names = {}
+        self.substrings = []
+        self.count = 0
+    
+    def add(self, folder, prefixes=(), names=(), contains=(), suffixes=()):
+        rule = (self.count, folder)
+        self.count += 1
+        
+        for prefix in prefixes:
+            self.prefixes.add(prefix, rule)
+        for name in names:
+            self.names.setdefault(name, rule)
+        for text in contains:
+            self.substrings.append((rule, text, False))
+        for text in suffixes:
+            self.substrings.append((rule, text, True))
+    
+    def classify(self, filename):
+        """
+        Returns the folder for filename, or None if it stays where it is.
+        """
+        best = self.prefixes.match(filename)
+        exact = self.names.get(filename)
+        if exact is not None and (best is None or exact[0] < best[0]):
+            best = exact
+        
+        for rule, text, suffix in self.substrings:
+            if best is not None and rule[0] >= best[0]:
+                break
+            if (filename.endswith(text) if suffix else text in filename):
+                best = rule
+                break
+        
+        return best[1] if best is not None else None
+
+def buildClassifier():
+    classifier = FileClassifier()
+    
+    # Mega Files
+    for datatype in largeDatatypes:
+        classifier.add(datatype, prefixes=[datatype + ' #'], names=[datatype + '.json'])
+    
+    # And Wanted Files
+    classifier.add("Item", prefixes=_numberedPrefixes([''], digits=3))
+    classifier.add("MerchantTable", contains=['MerchantTable.json'])
+    classifier.add("Recipe", contains=['Recipe '])
+    classifier.add("RecipeList", prefixes=['RecipeList'])
+    classifier.add("CharCustomization", prefixes=charCustomizationTags)
+    classifier.add("Npc", contains=npcSubstrings, suffixes=['WalkPath.json'])
+    classifier.add("Cutscene", contains=['Cutscene'])
+    classifier.add("WaterEdgeTile", prefixes=['Side_of_Water_Tiles'], contains=['water_edge_tiles'])
+    classifier.add("SunhavenTile", prefixes=sunhavenTilePrefixes)
+    classifier.add("NelvariTile", prefixes=nelvariTilePrefixes)
+    classifier.add("WithergateTile", prefixes=withergateTilePrefixes)
+    classifier.add("SceneSetting", contains=['SceneSettings'])
+    classifier.add("Quest", contains=['Quest.json'])
+    classifier.add("Mail", contains=['Mail'])
+    classifier.add("Clothes", prefixes=clothingTags + _numberedPrefixes(['chest']))
+    classifier.add("GiftTable", contains=['GiftTable.json'])
+    classifier.add("Tool", prefixes=toolPrefixes)
+    classifier.add("RecurringChest", prefixes=['RecurringChest'])
+    classifier.add("RecurringChest", prefixes=['DebugUIHandler'])
+    classifier.add("Perk", prefixes=_numberedPrefixes(perkPrefixes))
+    classifier.add("FloorTile", prefixes=floorTilePrefixes)
+    classifier.add("Controller", prefixes=hardwarePrefixes)
+    classifier.add("SkillLevelReward", prefixes=_numberedPrefixes(skillLevelPrefixes))
+    classifier.add("GoldenPom", prefixes=['GoldenPom'])
+    classifier.add("MuseumBundle", prefixes=['MuseumAquarium'], contains=museumBundles)
+    
+    return classifier
 
-    # iterate over files
-    for filename in os.listdir(srcFolder):
-        srcFilepath = os.path.join(srcFolder, filename)
-        # checking if it is a file
-        if isFile(srcFilepath):
+classifier = buildClassifier()
 
-            # Move Mega Files
-            for datatype in largeDatatypes:
-                if isLargeDatatype(filename, datatype):
-                    foldername = datatype
-                    break
-            else:
-                # And Wanted Files
-                if isItem(filename):
-                    foldername = "Item"
-                elif isMerchant(filename):
-                    foldername = "MerchantTable"
-                elif isRecipe(filename):
-                    foldername = "Recipe"
-                elif isRecipeList(filename):
-                    foldername = "RecipeList"
-                elif isCharCustomization(filename):
-                    foldername = "CharCustomization"
-                elif isNPC(filename):
-                    foldername = "Npc"
-                elif isCutscene(filename):
-                    foldername = "Cutscene"
-                elif isWaterEdgeTile(filename):
-                    foldername = "WaterEdgeTile"
-                elif isSunhavenTile(filename):
-                    foldername = "SunhavenTile"
-                elif isNelvariTile(filename):
-                    foldername = "NelvariTile"
-                elif isWithergateTile(filename):
-                    foldername = "WithergateTile"
-                elif isSceneSetting(filename):
-                    foldername = "SceneSetting"
-                elif isQuest(filename):
-                    foldername = "Quest"
-                elif isMail(filename):
-                    foldername = "Mail"
-                elif isClothes(filename):
-                    foldername = "Clothes"
-                elif isGiftTable(filename):
-                    foldername = "GiftTable"
-                elif isTool(filename):
-                    foldername = "Tool"
-                elif isRecurringChest(filename):
-                    foldername = "RecurringChest"
-                elif isDebugUIHandler(filename):
-                    foldername = "RecurringChest"
-                elif isPerk(filename):
-                    foldername = "Perk"
-                elif isFloorTile(filename):
-                    foldername = "FloorTile"
-                elif isHardware(filename):
-                    foldername = "Controller"
-                elif isSkillLevelReward(filename):
-                    foldername = "SkillLevelReward"
-                elif isGoldenPom(filename):
-                    foldername = "GoldenPom"
-                elif isMuseum(filename):
-                    foldername = "MuseumBundle"
-                else:
-                    continue
+def planClean(srcFolder, dstFolder):
+    """
+    Works out where every file in srcFolder is cleaned to, in one os.scandir pass, without moving anything.
+    
+    Returns a list of (source path, destination path). Files that already exist at their 
+    destination are left out with a warning, rather than being overwritten.
+    """
+    plan = []
+    with os.scandir(srcFolder) as entries:
+        for entry in entries:
+            # checking if it is a file
+            if not entry.is_file():
+                continue
             
-            dstFolderpath = os.path.join(dstFolder, foldername)
+            foldername = classifier.classify(entry.name)
+            if foldername is None:
+                continue
+            
+            plan.append((entry.path, os.path.join(dstFolder, foldername, entry.name)))
+    
+    # One listing per destination folder instead of a stat per file
+    existing = {}
+    for folder in {os.path.dirname(dst) for _, dst in plan}:
+        existing[folder] = set(os.listdir(folder)) if os.path.isdir(folder) else set()
+    
+    kept = []
+    for src, dst in plan:
+        if os.path.basename(dst) in existing[os.path.dirname(dst)]:
+            logging.warning(f"{dst} already exists, not moving {src}")
+        else:
+            kept.append((src, dst))
+    
+    return kept
+
+# How Clean puts files into their category folders. Everything but move leaves srcFolder as it was,
+# link makes hardlinks, falling back to symlinks and then copies where they aren't supported
+cleanModes = ['move', 'link', 'hardlink', 'symlink', 'copy']
+
+def writeCleanManifest(plan, manifestPath, mode='move'):
+    """
+    Writes each planned move as a "source,destination,mode" row.
+    """
+    with open(manifestPath, 'w', encoding='utf-8', newline='') as manifest_file:
+        writer = csv.writer(manifest_file)
+        for src, dst in plan:
+            writer.writerow([src, dst, mode])
+
+def readCleanManifest(manifestPath):
+    """
+    Returns a list of (source path, destination path, mode) from a manifest written by Clean.
+    """
+    plan = []
+    with open(manifestPath, 'r', encoding='utf-8', newline='') as manifest_file:
+        for row in csv.reader(manifest_file):
+            if not row:
+                continue
+            # Older manifests were tab separated
+            if len(row) == 1 and '\t' in row[0]:
+                row = row[0].split('\t')
+            # Manifests from before there were modes only have moves
+            mode = row[2] if len(row) > 2 else 'move'
+            plan.append((row[0], row[1], mode))
+    
+    return plan
+
+def writeCleanIndex(plan, indexPath):
+    """
+    Writes which files went into each category folder, as "category,filename" rows grouped by category.
+    The filenames are the same in srcFolder and in the category folder.
+    """
+    categories = {}
+    for _, dst in plan:
+        categories.setdefault(os.path.basename(os.path.dirname(dst)), []).append(os.path.basename(dst))
+    
+    with open(indexPath, 'w', encoding='utf-8', newline='') as index_file:
+        writer = csv.writer(index_file)
+        for category in sorted(categories):
+            for filename in sorted(categories[category]):
+                writer.writerow([category, filename])
+
+def _linkFile(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        try:
+            os.symlink(os.path.abspath(src), dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+def _placeFile(mode, move):
+    src, dst = move
+    if mode == 'move':
+        try:
+            # A rename when they're on the same drive
+            os.rename(src, dst)
+        except OSError:
+            shutil.move(src, dst)
+    elif mode == 'link':
+        _linkFile(src, dst)
+    elif mode == 'hardlink':
+        os.link(src, dst)
+    elif mode == 'symlink':
+        os.symlink(os.path.abspath(src), dst)
+    elif mode == 'copy':
+        shutil.copy2(src, dst)
+    else:
+        raise ValueError(f"Unknown clean mode {mode}")
+
+def runMoves(plan, workers=None, mode='move'):
+    """
+    Makes every destination folder once, then moves (or links, or copies) the files on a thread pool.
+    """
+    for folder in sorted({os.path.dirname(dst) for _, dst in plan}):
+        # If the folder does not exist, add it
+        if not isFolder(folder):
+            logging.debug("Making "+folder)
+            os.makedirs(folder, exist_ok=True)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() so the first failed move is raised here
+        list(pool.map(partial(_placeFile, mode), plan))
+
+def _isInside(path, folder):
+    path = os.path.realpath(path)
+    folder = os.path.realpath(folder)
+    return os.path.commonpath([path, folder]) == folder
 
-            # If the folder does not exist, add it
-            if not isFolder(dstFolderpath):
-                logging.debug("Making "+foldername)
-                os.mkdir(dstFolderpath)
+def Clean(srcFolder, dstFolder, manifestPath=None, dryRun=False, workers=None, mode='move'):
+    """
+    Sorts the files in srcFolder into category folders under dstFolder, moving them unless 
+    mode (one of cleanModes) says to link or copy them instead.
+    
+    The moves are planned first and written to manifestPath (clean_manifest.csv in dstFolder 
+    by default). With dryRun, that's all that happens. The manifest can be given to UndoClean 
+    to put the files back. Once the files are in place, clean_index.csv in dstFolder lists 
+    the files in each category. Modes other than move need dstFolder to be outside srcFolder.
+    """
+    if mode not in cleanModes:
+        raise ValueError(f"Unknown clean mode {mode}, expected one of {cleanModes}")
+    
+    # labelFiles walks every folder under srcFolder, so links or copies in there would get tagged next to their originals
+    if mode != 'move' and _isInside(dstFolder, srcFolder):
+        raise ValueError(f"{dstFolder} is inside {srcFolder}, {mode} needs the category folders somewhere else")
+    
+    plan = planClean(srcFolder, dstFolder)
+    
+    if manifestPath is None:
+        manifestPath = os.path.join(dstFolder, 'clean_manifest.csv')
+    os.makedirs(os.path.dirname(os.path.abspath(manifestPath)), exist_ok=True)
+    writeCleanManifest(plan, manifestPath, mode)
+    logging.debug(f"Planned {len(plan)} moves in {manifestPath}")
+    
+    if not dryRun:
+        runMoves(plan, workers, mode)
+        writeCleanIndex(plan, os.path.join(dstFolder, 'clean_index.csv'))
+    
+    return plan
 
-            # Move the file
-            shutil.move(srcFilepath, dstFolderpath)
+def UndoClean(manifestPath, workers=None):
+    """
+    Puts things back the way they were before the Clean that wrote manifestPath.
+    Moved files are moved back, links or copies are deleted, and so is the clean_index.csv 
+    that listed them.
+    """
+    moves = []
+    dstFolders = set()
+    for src, dst, mode in readCleanManifest(manifestPath):
+        # Every dst is dstFolder/category/filename
+        dstFolders.add(os.path.dirname(os.path.dirname(dst)))
+        if not os.path.lexists(dst):
+            continue
+        
+        if mode == 'move':
+            moves.append((dst, src))
+        else:
+            os.remove(dst)
+    
+    runMoves(moves, workers)
+    
+    for dstFolder in dstFolders:
+        indexPath = os.path.join(dstFolder, 'clean_index.csv')
+        if os.path.exists(indexPath):
+            os.remove(indexPath)
+    
+    return moves
@@ -0,0 +1,171 @@
+import os
+import mmap
+import array
+import struct
+import bisect
+import logging
+
+# magic, version, entry count
+_header = struct.Struct('<4sIQ')
+_magic = b'SHAI'
+_version = 1
+
+def writeAssetIndex(path, datums):
+    """
+    Writes datums, which must already be sorted by pID, as a binary asset index.
+
+    After the header comes every pID as an int64, then count + 1 uint64 offsets
+    into a blob holding "gID\\0name" for each entry in utf-8, with names cut and
+    stripped the way they're read from assets.csv. Arrays are written in the
+    machine's byte order, the index is only ever read where it was written.
+    """
+    pIDs = array.array('q')
+    offsets = array.array('Q', [0])
+    blob = bytearray()
+
+    for datum in datums:
+        pIDs.append(datum.pID)
+        # The same gID and name AssetsParser.buildIndex reads back from this datum's line in assets.csv
+        values = str(datum).split(',')
+        blob += f"{values[1]}\0{values[2].rstrip()}".encode('utf-8')
+        offsets.append(len(blob))
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as index_file:
+        index_file.write(_header.pack(_magic, _version, len(pIDs)))
+        index_file.write(pIDs.tobytes())
+        index_file.write(offsets.tobytes())
+        index_file.write(blob)
+    os.replace(temp_path, path)
+
+class AssetIndex:
+    """
+    A binary asset index opened with mmap. Lookups binary search the pID array,
+    so nothing is parsed up front and only the pages a lookup touches are read.
+
+    entries and duplicates work like the dictionaries AssetsParser.buildIndex
+    makes from a csv, so the two can be used interchangeably.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except:
+            self._file.close()
+            raise
+
+        try:
+            magic, version, count = _header.unpack_from(self._map, 0)
+            if magic != _magic or version != _version:
+                raise ValueError(f"{path} isn't a version {_version} asset index")
+
+            pIDs_start = _header.size
+            offsets_start = pIDs_start + count * 8
+            self._blob_start = offsets_start + (count + 1) * 8
+
+            view = memoryview(self._map)
+            self._pIDs = view[pIDs_start:offsets_start].cast('q')
+            self._offsets = view[offsets_start:self._blob_start].cast('Q')
+            view.release()
+
+            if self._blob_start + self._offsets[count] != len(self._map):
+                raise ValueError(f"{path} is truncated")
+        except:
+            self.close()
+            raise
+
+        self.count = count
+        self.entries = _Entries(self)
+        self.duplicates = _Duplicates(self)
+
+    def _range(self, pID):
+        start = bisect.bisect_left(self._pIDs, pID)
+        end = start
+        while end < self.count and self._pIDs[end] == pID:
+            end += 1
+        return start, end
+
+    def _entry(self, i):
+        text = self._map[self._blob_start + self._offsets[i]:self._blob_start + self._offsets[i + 1]].decode('utf-8')
+        gID, name = text.split('\0', 1)
+        return (gID, name)
+
+    def matches(self, pID):
+        """
+        Returns every (gID, name) for pID, in the order they were written.
+        """
+        start, end = self._range(pID)
+        return [self._entry(i) for i in range(start, end)]
+
+    def close(self):
+        for name in ('_pIDs', '_offsets'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+class _Entries:
+    """
+    pID -> the last (gID, name) for it, like the entries of a csv index.
+    """
+    def __init__(self, index):
+        self.index = index
+
+    def get(self, pID, default=None):
+        start, end = self.index._range(pID)
+        if start == end:
+            return default
+        return self.index._entry(end - 1)
+
+    def __contains__(self, pID):
+        start, end = self.index._range(pID)
+        return start != end
+
+    def __getitem__(self, pID):
+        entry = self.get(pID)
+        if entry is None:
+            raise KeyError(pID)
+        return entry
+
+    def __len__(self):
+        return self.index.count
+
+class _Duplicates:
+    """
+    pID -> every (gID, name) for it, only for pIDs with more than one.
+    """
+    def __init__(self, index):
+        self.index = index
+
+    def __contains__(self, pID):
+        start, end = self.index._range(pID)
+        return end - start > 1
+
+    def __getitem__(self, pID):
+        matches = self.index.matches(pID)
+        if len(matches) < 2:
+            raise KeyError(pID)
+        return matches
+
+def openAssetIndex(path, csvPath):
+    """
+    Opens the binary index at path, or returns None if it's missing, older than
+    the csv it was written with, or can't be read.
+    """
+    if not os.path.exists(path):
+        return None
+
+    if os.path.exists(csvPath) and os.path.getmtime(path) < os.path.getmtime(csvPath):
+        logging.warning(f"{path} is older than {csvPath}, not using it")
+        return None
+
+    try:
+        return AssetIndex(path)
+    except (OSError, ValueError, struct.error) as e:
+        logging.warning(f"Couldn't open {path}: {e}")
+        return None
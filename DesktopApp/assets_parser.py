@@ -1,117 +1,158 @@
-import math
-import operator
 import os
 import time
 import logging
+import threading
 import xml.etree.ElementTree as ET
 
+from DesktopApp.asset_index import openAssetIndex
 from DesktopApp.datum import Datum
 from DesktopApp.progress import Progress
 
+# Linkers with fewer files than this are parsed on the calling thread, it isn't worth handing them out
+minimumParallelFiles = 32
+
 class AssetsParser:
-    def __init__(self, csvPath, xmlPath, references_path, on_progress_updated) -> None:
+    def __init__(self, csvPath, xmlPath, references_path, on_progress_updated, index_path=None) -> None:
         self.csvPath = csvPath
+        self.index_path = index_path
         self.xmlPath = xmlPath
         self.references_path = references_path
         
         self.on_progress_updated = on_progress_updated
+        
+        self._indexes = {}
+        self._binary_indexes = []
+        self._index_lock = threading.Lock()
+
+    def buildIndex(self, path, label):
+        """
+        Reads a pID,gID,name csv into a dictionary keyed by integer pID.
+        
+        Returns (entries, duplicates) where entries maps each pID to the last 
+        (gID, name) seen for it, and duplicates holds every (gID, name) for 
+        the few pIDs that show up on more than one line.
+        """
+        tic = time.perf_counter()
+        
+        logging.debug(f'Indexing {label}')
+        self.on_progress_updated(Progress(f"Indexing stored {label}..."))
+        
+        entries = {}
+        duplicates = {}
+        with open(path, 'r') as csv_file:
+            for line in csv_file:
+                values = line.split(',')
+                pID = int(values[0])
+                entry = (values[1], values[2].rstrip())
+                
+                if pID in entries:
+                    if pID not in duplicates:
+                        duplicates[pID] = [entries[pID]]
+                    duplicates[pID].append(entry)
+                entries[pID] = entry
+        
+        toc = time.perf_counter()
+        logging.debug(f"Indexed {len(entries)} {label} in {toc - tic:0.4f} seconds")
+        
+        return (entries, duplicates)
+    
+    def getIndex(self, path, label):
+        """
+        Builds the index for the given csv the first time it is needed,
+        and reuses it for the rest of the run.
+        
+        assets.csv is looked up in the binary asset index instead when there is an up to date one.
+        """
+        # Linkers running at the same time wait here for the first one to finish building it
+        with self._index_lock:
+            if path not in self._indexes:
+                binary_index = None
+                if path == self.csvPath and self.index_path is not None:
+                    binary_index = openAssetIndex(self.index_path, self.csvPath)
+                
+                if binary_index is not None:
+                    logging.debug(f"Opened {binary_index.count} {label} from {self.index_path}")
+                    self._binary_indexes.append(binary_index)
+                    self._indexes[path] = (binary_index.entries, binary_index.duplicates)
+                else:
+                    self._indexes[path] = self.buildIndex(path, label)
+            
+            return self._indexes[path]
+    
+    def getMetadata(self, path):
+        """
+        Returns csvParseMetadataFile(path), only reading the file the first time it is asked for.
+        """
+        key = ('metadata', path)
+        with self._index_lock:
+            if key not in self._indexes:
+                self._indexes[key] = self.csvParseMetadataFile(path)
+            
+            return self._indexes[key]
+    
+    def clearIndexes(self):
+        """
+        Forgets every index, so they get rebuilt after the csv files are rewritten.
+        Binary indexes are closed, so their files can be replaced.
+        """
+        with self._index_lock:
+            for binary_index in self._binary_indexes:
+                binary_index.close()
+            self._binary_indexes = []
+            self._indexes = {}
 
     def csvParseAssetFile(self, datumList):
         tic = time.perf_counter()
 
-        # Opening csv
         logging.debug('Opening Asset Database')
         self.on_progress_updated(Progress("Reading from assets..."))
         
-        # Counting lines in the file for keeping track of progress
-        assets_csv = open(self.csvPath, 'r')
-        
-        lineCount = sum(1 for line in assets_csv)
-        incAmt = math.ceil(lineCount / 20)
-        
-        # Now actually reading the file
-        with open(self.csvPath, 'r') as assets_csv:
-            datumList.sort(key=operator.attrgetter('pID'))
-
-            logging.debug("Parsing Asset Database")
-            # all items data
-            count = 0
-            idx = 0
-            for line in assets_csv:
-                count += 1
-                if count >= incAmt:
-                    count = 0
-                    self.on_progress_updated(Progress(f"Looked at {count}/{lineCount} stored assets"))
-                    logging.debug(f"{count}/{lineCount}")
-                
-                values = line.split(',')
-                pID = values[0]
-                gID = values[1]
-                name = values[2].rstrip()
-
-                for i in range(idx, len(datumList)):
-                    if datumList[i].pID == pID:
-                        datumList[i].gID = gID
-                        datumList[i].name = name
-                    elif datumList[i].pID > pID:
-                        idx = i
-                        break
-
-            
-            toc = time.perf_counter()
-            logging.debug(f"Parsed Asset.csv in {toc - tic:0.4f} seconds")
-            self.on_progress_updated(Progress("Done looking at assets, for now..."))
+        entries, _ = self.getIndex(self.csvPath, "assets")
+        
+        logging.debug("Parsing Asset Database")
+        for datum in datumList:
+            entry = entries.get(int(datum.pID))
+            if entry is not None:
+                datum.gID, datum.name = entry
+        
+        toc = time.perf_counter()
+        logging.debug(f"Looked up {len(datumList)} assets in {toc - tic:0.4f} seconds")
+        self.on_progress_updated(Progress("Done looking at assets, for now..."))
 
-            return datumList
+        return datumList
         
 
     def csvParseReferenceFile(self, datumList):
         tic = time.perf_counter()
 
-        # Opening csv
-        logging.debug('Opening Asset Database')
-        self.on_progress_updated(Progress("Reading from assets..."))
+        logging.debug('Opening Reference Database')
+        self.on_progress_updated(Progress("Reading from references..."))
         
-        # Counting lines in the file for keeping track of progress
-        references_csv = open(self.references_path, 'r')
-        
-        lineCount = sum(1 for line in references_csv)
-        incAmt = math.ceil(lineCount / 20)
-        
-        # Now actually reading the file
-        with open(self.references_path, 'r') as references_csv:
-            datumList.sort(key=operator.attrgetter('pID'))
-
-            logging.debug("Parsing Reference Database")
-            # all items data
-            count = 0
-            idx = 0
-            for line in references_csv:
-                count += 1
-                if count >= incAmt:
-                    count = 0
-                    self.on_progress_updated(Progress(f"Looked at {count}/{lineCount} stored references"))
-                    logging.debug(f"{count}/{lineCount}")
-                
-                values = line.split(',')
-                pID = values[0]
-                gID = values[1]
-                name = values[2].rstrip()
-
-                for i in range(idx, len(datumList)):
-                    if datumList[i].pID == pID:
-                        datumList[i].gID = gID
-                        datumList[i].name = name
-                    # elif datumList[i].pID > pID:
-                    #     idx = i
-                    #     break
-
-            
-            toc = time.perf_counter()
-            logging.debug(f"Parsed references.csv in {toc - tic:0.4f} seconds")
-            self.on_progress_updated(Progress("Done looking at references..."))
+        entries, _ = self.getIndex(self.references_path, "references")
+        
+        logging.debug("Parsing Reference Database")
+        for datum in datumList:
+            entry = entries.get(int(datum.pID))
+            if entry is not None:
+                datum.gID, datum.name = entry
+        
+        toc = time.perf_counter()
+        logging.debug(f"Looked up {len(datumList)} references in {toc - tic:0.4f} seconds")
+        self.on_progress_updated(Progress("Done looking at references..."))
 
-            return datumList
+        return datumList
+        
+    def findReference(self, pID):
+        """
+        Returns the reference with the given pID as a Datum, or None if references.csv doesn't have it.
+        """
+        entries, _ = self.getIndex(self.references_path, "references")
+        
+        entry = entries.get(int(pID))
+        if entry is None:
+            return None
+        
+        return Datum(int(pID), entry[0], entry[1])
         
     def is_float(self, value):
         try:
@@ -123,58 +164,41 @@ class AssetsParser:
     def csvFindPossibleMatches(self, datumList):
         tic = time.perf_counter()
 
-        # Opening csv
         logging.debug('Opening Asset Database')
         self.on_progress_updated(Progress("Reading from assets..."))
         
-        # Counting lines in the file for keeping track of progress
-        assets_csv = open(self.csvPath, 'r')
-        
-        lineCount = sum(1 for line in assets_csv)
-        incAmt = math.ceil(lineCount / 20)
-        
-        # Now actually reading the file
-        with open(self.csvPath, 'r') as assets_csv:
-            datumList.sort(key=operator.attrgetter('pID'))
-
-            logging.debug("Parsing Asset Database: ")
-            # all items data
-            count = 0
-            idx = 0
-            for line in assets_csv:
-                count += 1
-                if count >= incAmt:
-                    count = 0
-                    self.on_progress_updated(Progress(f"Looked at {count}/{lineCount} stored assets"))
-                    logging.debug(f"{count}/{lineCount}")
-                
-                values = line.split(',')
-                pID = values[0]
-                gID = values[1]
-                name = values[2].rstrip()
-
-                for i in range(idx, len(datumList)):
-                    if datumList[i].pID == pID and not self.is_float(name):
-                        datumList[i].gID = gID
-                        datumList[i].name = name
-                        
-                        try:
-                            if name not in [x.name for x in datumList[i].item_candidates]:
-                                datumList[i].item_candidates.append(Datum(pID, gID, name))
-                        except: 
-                            pass
-                    elif datumList[i].pID > pID:
-                        idx = i
-                        break
-
-            
-            logging.debug("-|")
+        entries, duplicates = self.getIndex(self.csvPath, "assets")
+        
+        logging.debug("Parsing Asset Database: ")
+        for datum in datumList:
+            pID = int(datum.pID)
+            if pID in duplicates:
+                matches = duplicates[pID]
+            elif pID in entries:
+                matches = [entries[pID]]
+            else:
+                continue
             
-            toc = time.perf_counter()
-            logging.debug(f"Parsed Asset.csv in {toc - tic:0.4f} seconds")
-            self.on_progress_updated(Progress("Done looking at assets, for now..."))
+            for gID, name in matches:
+                if self.is_float(name):
+                    continue
+                
+                datum.gID = gID
+                datum.name = name
+                
+                try:
+                    if name not in [x.name for x in datum.item_candidates]:
+                        datum.item_candidates.append(Datum(pID, gID, name))
+                except: 
+                    pass
+        
+        logging.debug("-|")
+        
+        toc = time.perf_counter()
+        logging.debug(f"Looked up {len(datumList)} possible matches in {toc - tic:0.4f} seconds")
+        self.on_progress_updated(Progress("Done looking at assets, for now..."))
 
-            return datumList
+        return datumList
 
     def csvParseMetadataFile(self, srcPath):
         tic = time.perf_counter()
@@ -207,32 +231,92 @@ class AssetsParser:
         return files
     
     
-    def jsonParse(self, dataPath, srcPaths, getFunc):
-        def parseFile(fullPath, filename, objList):
-            logging.debug('Loading ' + filename)
-            r = getFunc(fullPath)
-            if r:
-                r.filename = filename
-                objList.append(r)
-
+    def jsonParse(self, dataPath, srcPaths, getFunc, executor=None, cache=None):
+        """
+        Runs getFunc on each of srcPaths (files, or folders of files) under dataPath.
+        
+        Files found in cache are reused, and files another caller is already parsing are 
+        waited for. The rest are parsed here one by one, or when there are enough of 
+        them, handed to executor in chunks. Either way the results keep the order of 
+        srcPaths and each one gets its filename set.
+        """
         objList = []
         if isinstance(srcPaths, str):
             srcPaths = [srcPaths]
 
+        files = []
         for srcPath in srcPaths:
             folderPath = os.path.join(dataPath, srcPath)
             if os.path.isdir(folderPath):
                 for filename in os.listdir(folderPath):
                     f = os.path.join(folderPath, filename)
                     if os.path.isfile(f):
-                        parseFile(f,filename,objList)
+                        files.append((f, filename))
             elif os.path.isfile(folderPath):
-                parseFile(folderPath,os.path.basename(srcPath),objList)
+                files.append((folderPath, os.path.basename(srcPath)))
             else:
                 logging.debug('File: ' + folderPath + " cannot be found")
 
+        results = [None] * len(files)
+        missing = []
+        waiting = []
+        for index, (fullPath, filename) in enumerate(files):
+            if cache is not None:
+                found, obj = cache.lookup(fullPath, getFunc)
+                if found:
+                    results[index] = obj
+                    continue
+                if obj is not None:
+                    # Another linker is parsing this file right now
+                    waiting.append((index, obj))
+                    continue
+            
+            logging.debug('Loading ' + filename)
+            missing.append(index)
 
-        return objList
+        paths = [files[index][0] for index in missing]
+        if executor is not None and len(paths) >= minimumParallelFiles:
+            # A few dozen files per chunk keeps the workers busy without sending every path on its own
+            chunk_size = max(1, min(64, len(paths) // 16))
+            parsed = executor.map(getFunc, paths, chunksize=chunk_size)
+        else:
+            parsed = map(getFunc, paths)
+        
+        stored = 0
+        try:
+            for index, obj in zip(missing, parsed):
+                if cache is not None:
+                    cache.store(files[index][0], getFunc, obj)
+                results[index] = obj
+                stored += 1
+        finally:
+            if cache is not None:
+                for index in missing[stored:]:
+                    cache.release(files[index][0], getFunc)
 
+        # Only wait once everything this call claimed is stored, so no one is left waiting on us
+        for index, event in waiting:
+            fullPath = files[index][0]
+            while True:
+                event.wait()
+                found, obj = cache.lookup(fullPath, getFunc)
+                if found:
+                    results[index] = obj
+                    break
+                if obj is None:
+                    # It couldn't be cached, or whoever had it gave up, so parse it here
+                    try:
+                        results[index] = getFunc(fullPath)
+                        cache.store(fullPath, getFunc, results[index])
+                    except:
+                        cache.release(fullPath, getFunc)
+                        raise
+                    break
+                event = obj
 
+        for (fullPath, filename), r in zip(files, results):
+            if r:
+                r.filename = filename
+                objList.append(r)
 
+        return objList
@@ -0,0 +1,289 @@
+import os
+import re
+import json
+from json.decoder import scanstring
+
+from DesktopApp.item_category import ItemCategory
+from DesktopApp.prefix_trie import PrefixTrie
+
+# Bump this whenever the tagging rules change, so labelFiles doesn't reuse tags from an older manifest
+labelVersion = 2
+
+armorTypes = ["chest", "pants", "gloves", "hat", "back", "ring", "amulet", "keepsake"]
+raceTypes = ["human", "elf", "amari", "naga", "elemental", "angel", "demon"]
+
+dataTypes = ['DataTile', 'Entity', 'MeshGenerator', 'AIAnimationTester', 'AnimationHandler', 'AnimationIndex', 'BlockedZoneTrigger', 'ClifMaker', 'DebugUIHandler']
+ambianceTypes = ['Plant', 'RendererShadows', 'AmbientLightZone', 'AmbientSound', 'CloudsMoving', 'LightFlicker', 'DecorativeTree', 'BigTree', 'LightGlow']
+uiTypes = ['Image', 'ActionBarIcon', 'AdaptiveUIScale', 'AnimalCanvas', 'AnimalNamingCanvas', 'CameraBounds', 'CameraController', 'CameraDrone', 'CameraZone', \
+    'CanvasScalar', 'CarnivalShopMoneyUI', 'CatenaryLineRenderer', 'CinematicCamera', 'ClothingColorButton', 'ClothingImageButton', 'CommunityTokenMoneyUI', \
+    'ContentSizeFitter', 'CraftingNotificationBubble', 'CraftingPanel', 'CraftingTable', 'CraftingTab', 'CraftingUI', 'CurrencyDepositButton', \
+    'CustomCurrencyMoneyUI', 'NavigationElement', 'TextMeshProUGUI', 'Slot', 'Button', 'TMP_SubMeshUI', 'TextSizer', 'ItemImage', 'Popup', 'OnHovor', \
+    'DOTweenAnimation', 'Canvas', 'UIButton', 'Slider']
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+# Everything up to the next bracket, stepping over whole strings so brackets inside them are ignored
+_nonStructural = re.compile(r'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_decoder = json.JSONDecoder()
+
+class _Unparsed:
+    __slots__ = ('start', 'end')
+    
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+class SniffedDocument:
+    """
+    A json object where only the top level keys have been read.
+    
+    Plain values (numbers, strings, bools) are decoded right away, but lists and 
+    objects are only decoded the first time they're looked up, so the tagging 
+    rules can check for keys without building every sprite and serialization array.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.fields = {}
+    
+    def __contains__(self, key):
+        return key in self.fields
+    
+    def keys(self):
+        return self.fields.keys()
+    
+    def __getitem__(self, key):
+        value = self.fields[key]
+        if isinstance(value, _Unparsed):
+            value = json.loads(self.text[value.start:value.end])
+            self.fields[key] = value
+        return value
+
+def _skipContainer(text, idx, indent):
+    """
+    Returns the index just past the list or object that starts at idx.
+    """
+    # Indented containers close on the first line that is just their own indent and a bracket,
+    # json strings can't hold a raw newline so that line can only be the real end
+    if text[idx + 1] in '\r\n':
+        end = text.find('\n' + indent + ('}' if text[idx] == '{' else ']'), idx)
+        if end != -1:
+            return end + len(indent) + 2
+    
+    depth = 0
+    length = len(text)
+    while idx < length:
+        idx = _nonStructural.match(text, idx).end()
+        if idx >= length:
+            break
+        
+        c = text[idx]
+        idx += 1
+        if c == '"':
+            break
+        elif c == '[' or c == '{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return idx
+    
+    raise ValueError("Unterminated list or object")
+
+def sniffJson(text):
+    """
+    Reads the top level of an indented json document without decoding any nested lists or objects.
+    Documents that aren't an indented json object are decoded normally.
+    """
+    idx = _whitespace.match(text).end()
+    if not text.startswith('{', idx):
+        return json.loads(text)
+    
+    document = SniffedDocument(text)
+    
+    start = idx + 1
+    idx = _whitespace.match(text, start).end()
+    
+    # The indent of the top level keys, skipping over a compact file is slower than decoding it
+    newline = text.rfind('\n', start, idx)
+    if newline == -1:
+        return json.loads(text)
+    indent = text[newline + 1:idx]
+    
+    if text[idx] == '}':
+        idx += 1
+    else:
+        while True:
+            if text[idx] != '"':
+                raise ValueError(f"Expected a key at {idx}")
+            key, idx = scanstring(text, idx + 1)
+            
+            idx = _whitespace.match(text, idx).end()
+            if text[idx] != ':':
+                raise ValueError(f"Expected ':' at {idx}")
+            idx = _whitespace.match(text, idx + 1).end()
+            
+            if text[idx] == '{' or text[idx] == '[':
+                end = _skipContainer(text, idx, indent)
+                document.fields[key] = _Unparsed(idx, end)
+            else:
+                document.fields[key], end = _decoder.raw_decode(text, idx)
+            
+            idx = _whitespace.match(text, end).end()
+            c = text[idx]
+            idx += 1
+            if c == '}':
+                break
+            elif c != ',':
+                raise ValueError(f"Expected ',' or '}}' at {idx - 1}")
+            idx = _whitespace.match(text, idx).end()
+    
+    if _whitespace.match(text, idx).end() != len(text):
+        raise ValueError(f"Extra data at {idx}")
+    
+    return document
+
+class TagRule:
+    """
+    One line of the tagging table.
+    
+    keys: the top level keys the rule looks at. All of them must be in the file,
+        or just one of them when anyKey is set.
+    tags: the text added to the file's tags, or a function of the file's data returning it.
+    when: an optional check on the file's data, the rule only applies when it's truthy.
+    """
+    def __init__(self, keys, tags, when=None, anyKey=False):
+        self.keys = keys
+        self.tags = tags
+        self.when = when
+        self.anyKey = anyKey
+    
+    def apply(self, data):
+        if not self.anyKey:
+            for key in self.keys:
+                if key not in data:
+                    return ""
+        
+        if self.when is not None and not self.when(data):
+            return ""
+        
+        if callable(self.tags):
+            return self.tags(data)
+        return self.tags
+
+def _armorTags(data):
+    tags = ""
+    if data['armorType'] <= 4:
+        if 'stats' in data and len(data['stats']) > 0:
+            tags += ",armor"
+        else:
+            tags += ",clothing"
+    return tags + ","+armorTypes[data['armorType']]
+
+def _hasDrops(data):
+    return ('_drops' in data and data['_drops'] and 'drops' in data['_drops'][0] and data['_drops'][0]['drops']) or \
+        ('_foliage' in data and data['_foliage'] and 'drops' in data['_foliage'])
+
+# Tags are written in the order of this list
+tagRules = [
+    TagRule(['id', 'canSell'], ",item"),
+    TagRule(['enemyName'], ",enemy", when=lambda data: data['enemyName']),
+    TagRule(['questName'], ",quest", when=lambda data: isinstance(data['questName'], str)),
+    TagRule(['category'], lambda data: f",{ItemCategory.from_index(data['category']).value}"),
+    TagRule(['armorType'], _armorTags),
+    TagRule(['stats'], ",statted", when=lambda data: len(data['stats']) > 0),
+    TagRule(['availableAtCharacterSelect'], ",character customization"),
+    TagRule(['availableRaces'], lambda data: "".join(["," + raceTypes[r] for r in data['availableRaces']])),
+    TagRule(['_clothingLayerInfo'], ",sprite list"),
+    TagRule(['canDropRustyKey'], ",mine"),
+    TagRule(['dungeonEntrance'], ",dungeon floor"),
+    TagRule(['lockedText'], ",dungeon chest"),
+    TagRule(['animalName'], ",animal"),
+    TagRule(['bundle'], ",museum bundle"),
+    TagRule(['interactiveText'], ",beehive box", when=lambda data: data['interactiveText'] == 'Bee Hive Box'),
+    TagRule(['bookName'], ",book"),
+    TagRule(['text'], ",readable", when=lambda data: data['text']),
+    TagRule(['npc'], ",npc", when=lambda data: data['npc']),
+    TagRule(['love'], ",gift table", when=lambda data: data['love']),
+    TagRule(['startingItems'], ",merchant table"),
+    TagRule(['input', 'output'], ",recipe"),
+    TagRule(['craftingRecipes'], ",recipe list", when=lambda data: data['craftingRecipes']),
+    TagRule(['_drops', '_foliage'], ",drop table", when=_hasDrops, anyKey=True),
+    TagRule(['drops'], ",destructible", when=lambda data: 'drops' in data['drops']),
+    TagRule(['fish'], lambda data: ",fish net" if 'large' in data else ",fish spawner", 
+            when=lambda data: data['fish'] and 'drops' in data['fish'] and data['fish']['drops']),
+    TagRule(['cropStages'], ",seed"),
+]
+
+# Files starting with these are tagged without being opened
+trashTypes = [
+    (dataTypes, ',trash,data'),
+    (ambianceTypes, ',trash,ambiance'),
+    (uiTypes, ',trash,ui element'),
+]
+
+def compileTagRules(rules):
+    """
+    Returns {key: [rule indexes]} so a file only runs the rules for keys it actually has.
+    Rules that need every one of their keys are only listed under the first, 
+    since they can't apply without it.
+    """
+    dispatch = {}
+    for index, rule in enumerate(rules):
+        trigger_keys = rule.keys if rule.anyKey else rule.keys[:1]
+        for key in trigger_keys:
+            dispatch.setdefault(key, []).append(index)
+    
+    return dispatch
+
+def compileTrashPrefixes(types):
+    trie = PrefixTrie()
+    for prefixes, tags in types:
+        for prefix in prefixes:
+            trie.add(prefix, tags)
+    
+    return trie
+
+tagDispatch = compileTagRules(tagRules)
+trashPrefixes = compileTrashPrefixes(trashTypes)
+
+def applyTagRules(data):
+    candidates = set()
+    for key in data.keys() & tagDispatch.keys():
+        candidates.update(tagDispatch[key])
+    
+    tags = ""
+    for index in sorted(candidates):
+        tags += tagRules[index].apply(data)
+    
+    return tags
+
+def labelFile(filePath, srcPath):
+    """
+    Works out the tags for a single MonoBehaviour file.
+
+    Returns a (relative path, tags) tuple, where tags is the comma-prefixed
+    string written after the path in fileTypes.csv, or None for files that
+    aren't json and don't get a line at all.
+
+    This lives outside of Parser so it can be sent to worker processes.
+    """
+    filename = os.path.relpath(filePath, os.path.join(srcPath,'..'))
+
+    if not filename.endswith('.json'):
+        return None
+
+    trash_tags = trashPrefixes.match(os.path.basename(filename))
+    if trash_tags is not None:
+        return (filename, trash_tags)
+
+    tags = ""
+    with open(filePath) as inner_file:
+        try:
+            data = sniffJson(inner_file.read())
+            
+            # Files that are just a list or a value have no keys for the rules to look at
+            if isinstance(data, (dict, SniffedDocument)):
+                tags = applyTagRules(data)
+        except:
+            tags = ",unparseable"
+
+    return (filename, tags)
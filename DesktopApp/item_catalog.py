@@ -0,0 +1,42 @@
+import logging
+
+rarityNames = ["Common", "Uncommon", "Rare", "Epic", "Legendary"]
+
+class ItemCatalog:
+    """
+    Every item in the game, parsed once per run and shared by the linkers
+    that need to know about items other than the ones they link.
+    """
+    def __init__(self, items, craftable=()):
+        """
+        items: every Item, with filename set.
+        craftable: file names (without folders) of the items tagged craftable. Only those have their rarity
+            indexed, the same as when rarities were looked up in fileTypes.csv.
+        """
+        self.items = items
+        self.by_gID = {}
+        self.rarities = {}
+
+        for item in items:
+            try:
+                self.by_gID.setdefault(item.gID, item)
+            except ValueError:
+                logging.debug(f"Item {item.filename} has no gID")
+
+            if item.filename in craftable and item.name and isinstance(item.rarity, int) and 0 <= item.rarity < len(rarityNames):
+                self.rarities.setdefault(item.name, rarityNames[item.rarity])
+
+    def rarity(self, name, default=None):
+        """
+        Returns the rarity ("Common" to "Legendary") of the first craftable item called name.
+        """
+        return self.rarities.get(name, default)
+
+    def get(self, gID, default=None):
+        """
+        Returns the item with the given gID, which can be a string from assets.csv, or default if there isn't one.
+        """
+        try:
+            return self.by_gID.get(int(gID), default)
+        except (TypeError, ValueError):
+            return default
@@ -1,8 +1,9 @@
 
 
 class LinkerFunction:
-    def __init__(self, label, tag, callable):
+    def __init__(self, label, tag, callable, requires=None):
         self.label = label
         self.output_filename = "".join(label.split(" ")) + ".txt"
         self.tag = tag
-        self.callable = callable
\ No newline at end of file
+        self.callable = callable
+        self.requires = requires or []
\ No newline at end of file
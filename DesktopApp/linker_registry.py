@@ -8,21 +8,25 @@ class LinkerRegistry:
     linkers: List[LinkerFunction] = []
     
     @classmethod
-    def register(cls, *args):
+    def register(cls, *args, requires=None):
         """
         Usage: 
         
-        @LinkerRegistry.register("Drop Tables", "drop table")
+        @LinkerRegistry.register("Drop Tables", "drop table", requires=["metadata", "assets"])
         def linkDropTables(props):
             pass
         
+        requires lists what has to be ready before the linker runs, either 
+        shared data ("metadata", "assets", "references") or the label of 
+        another linker whose output it reads.
         """
         def decorator(fn):
             cls.linkers.append(
                 LinkerFunction(
                     label=args[0], 
                     tag=args[1] if len(args) > 1 else None,
-                    callable=fn 
+                    callable=fn,
+                    requires=requires
                 )
             )
             return fn
@@ -0,0 +1,49 @@
+class Offer:
+    """
+    One item a merchant sells, and what it costs there.
+    """
+    def __init__(self, merchant, item):
+        self.merchant = merchant
+        self.item = item
+
+    @property
+    def value(self):
+        return self.item.value
+
+    @property
+    def currency(self):
+        return self.item.currency
+
+    def __str__(self):
+        return f"{self.merchant}: {self.item.value} {self.item.currency}"
+
+class MerchantCatalog:
+    """
+    Everything every merchant sells, indexed by item name and pID so linkers
+    can look up where an item is bought and for how much.
+    """
+    def __init__(self, merchants):
+        """
+        merchants: every Merchant, with filename set and item names looked up.
+        """
+        self.merchants = merchants
+        self.by_name = {}
+        self.by_pID = {}
+
+        for merchant in merchants:
+            for item in merchant.items:
+                offer = Offer(merchant.filename, item)
+                self.by_pID.setdefault(item.pID, []).append(offer)
+                if item.name:
+                    self.by_name.setdefault(item.name, []).append(offer)
+
+    def offers(self, name, merchant_filter=None):
+        """
+        Returns the offers for the item called name, in the order the merchants were given,
+        keeping only merchants whose filename passes merchant_filter if there is one.
+        """
+        offers = self.by_name.get(name, [])
+        if merchant_filter is not None:
+            offers = [x for x in offers if merchant_filter(x.merchant)]
+
+        return offers
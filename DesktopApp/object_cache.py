@@ -0,0 +1,98 @@
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+
+class ObjectCache:
+    """
+    Keeps what a getFunc returned for each file, so a file that more than one
+    linker reads is only opened and decoded once per run, even when those
+    linkers ask for it at the same time.
+
+    Objects are kept pickled, and every lookup hands back a fresh copy. That way
+    a linker filling in names or workbenches can't change what the next linker
+    sees, and the size of the cache is just the size of the pickles. Once the
+    cache is over max_bytes the least recently used files are dropped.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        # Files someone is parsing right now, so everyone else waits for them instead of parsing them again
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, path, getFunc):
+        """
+        Returns (True, a copy of the cached object) if this file has been parsed.
+
+        Otherwise the file is claimed and (False, None) is returned, and the caller has to
+        parse it and then store or release it. If another caller has already claimed it,
+        (False, event) is returned instead, and the file can be looked up again once event
+        is set. Callers should parse everything they claimed before waiting on an event,
+        so two linkers waiting on each other's files can't get stuck.
+        """
+        key = (path, getFunc)
+
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                event = self._pending.get(key)
+                if event is not None:
+                    return (False, event)
+
+                self._pending[key] = threading.Event()
+                self.misses += 1
+
+        if blob is None:
+            return (False, None)
+
+        return (True, pickle.loads(blob))
+
+    def store(self, path, getFunc, obj):
+        """
+        Remembers what getFunc returned for path. This should happen before anything changes obj.
+        """
+        key = (path, getFunc)
+
+        try:
+            blob = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            logging.debug(f"Not caching {path}, it can't be pickled")
+            blob = None
+
+        if blob is not None and len(blob) > self.max_bytes:
+            blob = None
+
+        with self._lock:
+            if blob is not None and key not in self._entries:
+                self._entries[key] = blob
+                self.size += len(blob)
+
+                while self.size > self.max_bytes:
+                    _, dropped = self._entries.popitem(last=False)
+                    self.size -= len(dropped)
+
+            self._release(key)
+
+    def release(self, path, getFunc):
+        """
+        Gives up a claim on path without storing anything, e.g. when parsing it failed.
+        Anyone waiting on it will look it up again and parse it themselves.
+        """
+        with self._lock:
+            self._release((path, getFunc))
+
+    def _release(self, key):
+        event = self._pending.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses, {len(self._entries)} files in {self.size} bytes"
@@ -2,15 +2,49 @@
 from operator import truediv
 import re
 import os
+import sys
 import xml.etree.ElementTree as ET
 import math
 import time
-import json
 import logging
-from DesktopApp.item_category import ItemCategory
+import threading
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from DesktopApp.datum import Datum
 from DesktopApp.assets_parser import AssetsParser
+from DesktopApp.asset_index import writeAssetIndex
+from DesktopApp.object_cache import ObjectCache
 from DesktopApp.progress import Progress
+from DesktopApp.file_labeler import labelFile, labelVersion
+
+fishSpawnerPattern = re.compile("[A-Za-z]+FishSpawner.*")
+
+def processWorkers(workers=None):
+    """
+    How many processes a ProcessPoolExecutor should start for workers, None meaning every core.
+    On Windows it can't wait on more than 61 processes, so that's as many as it gets.
+    """
+    workers = workers or os.cpu_count() or 1
+    if sys.platform == 'win32':
+        workers = min(workers, 61)
+    return workers
+
+def scanFiles(path):
+    """
+    Walks every file under path in the same order as os.walk, 
+    yielding DirEntry objects so their stats come straight from the directory listing.
+    """
+    subdirs = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            else:
+                yield entry
+    
+    for subdir in subdirs:
+        yield from scanFiles(subdir)
 
 class Parser:
     def __init__(self, 
@@ -19,10 +53,26 @@ class Parser:
                 code_path,
                 output_path, 
                 on_progress_update, 
-                skip_setup=False
+                skip_setup=False,
+                label_workers=None,
+                json_executor="process",
+                json_workers=None,
+                linker_workers=None
                 ) -> None:
         self.gameVersion = game_version
         
+        # How many processes read MonoBehaviour files at once, None uses every core and 1 reads them one by one
+        self.label_workers = label_workers
+        
+        # How linkers parse their files: "serial", "thread" or "process", and with how many workers (None uses every core)
+        self.json_executor = json_executor
+        self.json_workers = json_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+        # How many linkers can run at the same time, None uses every core and 1 runs them one by one
+        self.linker_workers = linker_workers
+        
         self.on_progress_update = on_progress_update
         
         self.codePath = f"{code_path}/SunHaven.Core/Wish"
@@ -31,47 +81,85 @@ class Parser:
         self.xmlPath = f'{data_path}/assets.xml'
         self.csvPath = f'{data_path}/assets.csv'
         self.refPath = f'{data_path}/references.csv'
-        self.assets_parser = AssetsParser(self.csvPath, self.xmlPath, self.refPath, on_progress_update)
+        self.fishSpawnerPath = f'{data_path}/fishSpawners.csv'
+        self.indexPath = f'{data_path}/assets.idx'
+        # Describes the MonoBehaviour folder rather than one output, so every game version set up from this data can reuse it
+        self.labelManifestPath = f'{data_path}/fileTypes_manifest.csv'
+        self.assets_parser = AssetsParser(self.csvPath, self.xmlPath, self.refPath, on_progress_update, self.indexPath)
+        
+        # Objects parsed by the linkers, shared for the rest of this run
+        self.object_cache = ObjectCache()
+        
+        # Catalogs built from linker files, like every item in the game, shared for the rest of this run
+        self._catalogs = {}
+        self._catalog_lock = threading.RLock()
         
         if not skip_setup:
-            self.xml2csv(self.xmlPath, self.csvPath, self.refPath)
+            self.xml2csv(self.xmlPath, self.csvPath, self.refPath, self.fishSpawnerPath, self.indexPath)
 
         self.outputPath = output_path
         self.dstPath = os.path.join(output_path, game_version, 'fileTypes.csv')
         os.makedirs(os.path.join(output_path, game_version), exist_ok=True)
         
         if not skip_setup:
-            self.labelFiles(f"{data_path}/MonoBehaviour", self.dstPath)
+            self.labelFiles(f"{data_path}/MonoBehaviour", self.dstPath, self.labelManifestPath)
 
     
-    def xml2csv(self, srcPath, assets_csv, references_path):
+    def getCatalog(self, name, build):
+        """
+        Returns the catalog called name, calling build() to make it the first time it's asked for.
+        """
+        with self._catalog_lock:
+            if name not in self._catalogs:
+                self._catalogs[name] = build()
+            
+            return self._catalogs[name]
+
+    def linkerExecutor(self):
+        """
+        Returns the executor linkers parse their files with, or None when parsing serially.
+        It's started the first time it's needed and kept until shutdownExecutor.
+        """
+        if self.json_executor == "serial":
+            return None
+        
+        with self._executor_lock:
+            if self._executor is None:
+                if self.json_executor == "thread":
+                    self._executor = ThreadPoolExecutor(max_workers=self.json_workers or os.cpu_count() or 1)
+                elif self.json_executor == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=processWorkers(self.json_workers))
+                else:
+                    raise ValueError(f"Unknown json executor: {self.json_executor}")
+            
+            return self._executor
+    
+    def shutdownExecutor(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def xml2csv(self, srcPath, assets_csv, references_path, fish_spawners_path=None, index_path=None, streaming=True):
         logging.debug('Opening assets.xml')
         self.on_progress_update(Progress("Viewing GIGANTIC list of assets..."))
-        tree = ET.parse(srcPath)
-        root = tree.getroot()
 
-        elementCount = sum(1 for _ in root)
-        increment = math.ceil(elementCount / 20)
+        if streaming:
+            assets = self.streamAssets(srcPath)
+        else:
+            assets = self.loadAssets(srcPath)
 
         objList = []
         references = []
+        fish_spawners = []
 
         logging.debug("Parsing assets.xml")
         # all items data
-        count = 0
-        total_processed = 0
-        for elem in root:
-            total_processed += 1
-            count += 1
-            if count >= increment:
-                self.on_progress_update(Progress(f"Scanned {total_processed}/{elementCount} assets..."))
-                count = 0
-                logging.debug(f"Scanned {total_processed}/{elementCount} assets...")
-
+        for elem in assets:
             container = elem.find('Container')
             is_progress_container = container is not None and container.text is not None and 'progress' in container.text
 
-            pID = elem.find('PathID').text
+            pID = int(elem.find('PathID').text)
             gID = ""
             name = ""
             data = elem.find('Name').text.split(' - ')
@@ -84,64 +172,223 @@ class Parser:
             if gID:
                 objList.append(Datum(pID, gID, name))
             
-            if re.match("[A-Za-z]+FishSpawner.*", name) is not None or \
-                is_progress_container or name.startswith('RecipeList_'):
+            is_fish_spawner = fishSpawnerPattern.match(name) is not None
+            if is_fish_spawner:
+                fish_spawners.append(Datum(pID, "0", name))
+            
+            if is_fish_spawner or is_progress_container or name.startswith('RecipeList_'):
                 references.append(Datum(pID, "0", name))
 
-
         logging.debug("\nSorting")
-        objList.sort()
+        objList.sort(key=Datum.sortKey)
 
         logging.debug("Writing to Disk")
         
+        # Let go of the old files before they're replaced
+        self.assets_parser.clearIndexes()
+        
         os.makedirs(self.dataPath, exist_ok=True)
         f = open(assets_csv, "w")
         for obj in objList:
             f.write(str(obj) + '\n')
         f.close()
         
+        # Written after assets.csv, so it's only used while it's at least as new
+        if index_path is not None:
+            writeAssetIndex(index_path, objList)
+        
         with open(references_path, "w") as reference_file:
             for obj in references:
                 reference_file.write(str(obj) + '\n')
             reference_file.close()
         
-    def labelFiles(self, srcPath, dstPath):
-        def isFileType(f, types):
-            name = os.path.basename(f)
-            for datatype in types:
-                if name.startswith(datatype):
-                    return True
-            return False
+        if fish_spawners_path is not None:
+            self.writeFishSpawnerLocations(fish_spawners, fish_spawners_path)
+        
+        self.assets_parser.clearIndexes()
+        
+    def writeFishSpawnerLocations(self, fish_spawners, path):
+        """
+        Writes the GameObject pID and location of each fish spawner, which is its 
+        name without "FishSpawner", keeping the first name seen for each pID.
+        """
+        locations = {}
+        for spawner in fish_spawners:
+            locations.setdefault(spawner.pID, spawner.name.replace("FishSpawner", ""))
+        
+        with open(path, "w") as fish_spawner_file:
+            for pID, location in locations.items():
+                fish_spawner_file.write(f"{pID},0,{location}\n")
+    
+    def getFishSpawnerLocations(self):
+        """
+        Returns {GameObject pID: (gID, location)} for every fish spawner.
+        """
+        if not os.path.exists(self.fishSpawnerPath):
+            # Data from before the fish spawner table was written, the spawners can still be picked out of the references
+            logging.warning(f"{self.fishSpawnerPath} is missing, building it from {self.refPath}")
+            with open(self.refPath, 'r') as ref_file:
+                fish_spawners = []
+                for line in ref_file:
+                    if line.strip():
+                        pID, gID, name = line.rstrip('\n').split(',', 2)
+                        fish_spawners.append(Datum(int(pID), gID, name))
+            
+            self.writeFishSpawnerLocations([x for x in fish_spawners if fishSpawnerPattern.match(x.name)], self.fishSpawnerPath)
+        
+        entries, _ = self.assets_parser.getIndex(self.fishSpawnerPath, "fish spawner locations")
+        return entries
+    
+    def loadAssets(self, srcPath):
+        """
+        Reads all of assets.xml into memory before yielding each <Asset> element.
+        """
+        tree = ET.parse(srcPath)
+        root = tree.getroot()
+
+        elementCount = sum(1 for _ in root)
+        increment = math.ceil(elementCount / 20)
+
+        count = 0
+        total_processed = 0
+        for elem in root:
+            total_processed += 1
+            count += 1
+            if count >= increment:
+                self.on_progress_update(Progress(f"Scanned {total_processed}/{elementCount} assets..."))
+                count = 0
+                logging.debug(f"Scanned {total_processed}/{elementCount} assets...")
+
+            yield elem
+
+    def streamAssets(self, srcPath):
+        """
+        Yields each <Asset> element as soon as it is closed, then frees it.
+        Only one asset is held in memory at a time, and progress is based on 
+        how many bytes of assets.xml have been read so far.
+        """
+        file_size = os.path.getsize(srcPath)
+        increment = math.ceil(file_size / 20)
+        next_update = increment
+
+        with open(srcPath, 'rb') as xml_file:
+            context = ET.iterparse(xml_file, events=('start', 'end'))
+            _, root = next(context)
+
+            for event, elem in context:
+                if event != 'end' or elem.tag != 'Asset':
+                    continue
+
+                yield elem
+                root.clear()
 
+                bytes_read = xml_file.tell()
+                if bytes_read >= next_update:
+                    next_update = bytes_read + increment
+                    percent = math.floor(bytes_read / file_size * 100)
+                    self.on_progress_update(Progress(f"Scanned {percent}% of assets..."))
+                    logging.debug(f"Scanned {bytes_read}/{file_size} bytes of assets...")
+
+    def labelFiles(self, srcPath, dstPath, manifestPath=None, incremental=True):
+        """
+        Writes fileTypes.csv, tagging every json file in srcPath.
+        
+        Along with it, a manifest of each file's size, modified time and tags is kept 
+        at manifestPath, next to srcPath by default. When incremental is set, only files 
+        that were added or changed since the last manifest get opened again, the rest 
+        reuse their old tags, whichever game version they were labelled for.
+        """
         tic = time.perf_counter()
         
         logging.debug('Reading all files')
         self.on_progress_update(Progress(f"Reading all files. This will take a while to complete..."))
 
-        files = [os.path.join(dir_path, file) for dir_path, dn, file_names in os.walk(srcPath) for file in file_names]
+        parentPath = os.path.join(srcPath, '..')
+        if manifestPath is None:
+            manifestPath = os.path.join(parentPath, 'fileTypes_manifest.csv')
+        
+        files = []
+        for entry in scanFiles(srcPath):
+            if not entry.name.endswith('.json'):
+                continue
+            
+            stat = entry.stat()
+            files.append((entry.path, os.path.relpath(entry.path, parentPath), stat.st_size, stat.st_mtime_ns))
+
+        previous = self.readLabelManifest(manifestPath) if incremental else {}
+        changed = [filePath for filePath, filename, size, mtime in files \
+            if filename not in previous or previous[filename][:2] != (size, mtime)]
+        
+        removed = len(previous) - (len(files) - len(changed))
+        logging.debug(f"{len(files)} files, {len(changed)} new or changed, {removed} removed")
+        if previous:
+            self.on_progress_update(Progress(f"Found {len(changed)} new or changed files..."))
+
+        labels = self.labelChangedFiles(changed, srcPath)
+
+        with open(dstPath, "w") as label_file, open(manifestPath, "w") as manifest_file:
+            manifest_file.write(f"{labelVersion}\n")
+            for filePath, filename, size, mtime in files:
+                if filename in labels:
+                    tags = labels[filename]
+                else:
+                    tags = previous[filename][2]
+                
+                label_file.write(filename + tags +'\n')
+                manifest_file.write(f"{filename}\t{size}\t{mtime}\t{tags}\n")
+        
+        self.assets_parser.clearIndexes()
 
+        toc = time.perf_counter()
+        logging.debug(f"Read all files in {toc - tic:0.4f} seconds")
+
+    def readLabelManifest(self, manifestPath):
+        """
+        Returns {relative path: (size, mtime_ns, tags)} from the last labelFiles run.
+        Missing manifests, or ones written with older tag rules, come back empty.
+        """
+        manifest = {}
+        if not os.path.isfile(manifestPath):
+            return manifest
+        
+        with open(manifestPath, 'r') as manifest_file:
+            if manifest_file.readline().rstrip('\n') != str(labelVersion):
+                logging.debug("Label manifest is out of date, relabelling everything")
+                return manifest
+            
+            for line in manifest_file:
+                filename, size, mtime, tags = line.rstrip('\n').split('\t')
+                manifest[filename] = (int(size), int(mtime), tags)
+        
+        return manifest
+
+    def labelChangedFiles(self, files, srcPath):
+        """
+        Tags each of the given files, returning {relative path: tags}.
+        """
         file_count = len(files)
         progress_increment = math.ceil(file_count / 20)
         count = 0
 
-        armorTypes = ["chest", "pants", "gloves", "hat", "back", "ring", "amulet", "keepsake"]
-        raceTypes = ["human", "elf", "amari", "naga", "elemental", "angel", "demon"]
-
-        dataTypes = ['DataTile', 'Entity', 'MeshGenerator', 'AIAnimationTester', 'AnimationHandler', 'AnimationIndex', 'BlockedZoneTrigger', 'ClifMaker', 'DebugUIHandler']
-        ambianceTypes = ['Plant', 'RendererShadows', 'AmbientLightZone', 'AmbientSound', 'CloudsMoving', 'LightFlicker', 'DecorativeTree', 'BigTree', 'LightGlow']
-        uiTypes = ['Image', 'ActionBarIcon', 'AdaptiveUIScale', 'AnimalCanvas', 'AnimalNamingCanvas', 'CameraBounds', 'CameraController', 'CameraDrone', 'CameraZone', \
-            'CanvasScalar', 'CarnivalShopMoneyUI', 'CatenaryLineRenderer', 'CinematicCamera', 'ClothingColorButton', 'ClothingImageButton', 'CommunityTokenMoneyUI', \
-            'ContentSizeFitter', 'CraftingNotificationBubble', 'CraftingPanel', 'CraftingTable', 'CraftingTab', 'CraftingUI', 'CurrencyDepositButton', \
-            'CustomCurrencyMoneyUI', 'NavigationElement', 'TextMeshProUGUI', 'Slot', 'Button', 'TMP_SubMeshUI', 'TextSizer', 'ItemImage', 'Popup', 'OnHovor', \
-            'DOTweenAnimation', 'Canvas', 'UIButton', 'Slider']
-
         logging.debug(file_count)
 
         logging.debug("Parsing Asset Database")
         
+        workers = processWorkers(self.label_workers)
+        executor = None
+        if workers > 1 and file_count > 1:
+            # Hand each worker a large shard of files at once, map() still returns results in file order
+            logging.debug(f"Labelling files with {workers} workers")
+            executor = ProcessPoolExecutor(max_workers=workers)
+            chunk_size = max(1, math.ceil(file_count / (workers * 16)))
+            results = executor.map(partial(labelFile, srcPath=srcPath), files, chunksize=chunk_size)
+        else:
+            results = (labelFile(filePath, srcPath) for filePath in files)
+        
+        labels = {}
         total_processed = 0
-        with open(dstPath, "w") as label_file:
-            for filePath in files:
+        try:
+            for label in results:
                 count += 1
                 total_processed += 1
                 if count >= progress_increment:
@@ -149,97 +396,13 @@ class Parser:
                     count = 0
                     logging.debug(f"Scanned {total_processed}/{file_count} files...")
                 
-                filename = os.path.relpath(filePath, os.path.join(srcPath,'..'))
-
-                if not filename.endswith('.json'):
-                    continue
-
-                if isFileType(filename, dataTypes):
-                    label_file.write(filename + ',trash,data\n')
+                if label is None:
                     continue
+                
+                filename, tags = label
+                labels[filename] = tags
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
-                if isFileType(filename, ambianceTypes):
-                    label_file.write(filename + ',trash,ambiance\n')
-                    continue
-
-                if isFileType(filename, uiTypes):
-                    label_file.write(filename + ',trash,ui element\n')
-                    continue
-
-                tags = ""
-                with open(filePath) as inner_file:
-                    try:
-                        data = json.load(inner_file)
-
-                        if 'id' in data and 'canSell' in data:
-                            tags += ",item"
-                        if 'enemyName' in data and data['enemyName']:
-                            tags += ",enemy"
-                        if 'questName' in data and isinstance(data['questName'], str):
-                            tags += ",quest"
-                        if 'category' in data:
-                            tags += f",{ItemCategory.from_index(data['category']).value}"
-                        if 'armorType' in data:
-                            if data['armorType'] <= 4:
-                                if 'stats' in data and len(data['stats']) > 0:
-                                    tags += ",armor"
-                                else:
-                                    tags += ",clothing"
-                            tags += ","+armorTypes[data['armorType']]
-                        if 'stats' in data and len(data['stats']) > 0:
-                            tags += ",statted"
-                        if 'availableAtCharacterSelect' in data:
-                            tags += ",character customization"
-                        if 'availableRaces' in data:
-                            for r in data['availableRaces']:
-                                tags += "," + raceTypes[r]
-                        if '_clothingLayerInfo' in data:
-                            tags += ",sprite list"
-                        if 'canDropRustyKey' in data:
-                            tags += ",mine"
-                        if 'dungeonEntrance' in data:
-                            tags += ",dungeon floor"
-                        if 'lockedText' in data:
-                            tags += ",dungeon chest"
-                        if 'animalName' in data:
-                            tags += ",animal"
-                        if 'bundle' in data:
-                            tags += ",museum bundle"
-                        if 'interactiveText' in data and data['interactiveText'] == 'Bee Hive Box':
-                            tags += ",beehive box"
-                        if 'bookName' in data:
-                            tags += ",book"
-                        if 'text' in data and data['text']:
-                            tags += ",readable"
-                        if 'npc' in data and data['npc']:
-                            tags += ",npc"
-                        if 'love' in data and data['love']:
-                            tags += ",gift table"
-                        if 'startingItems' in data:
-                            tags += ",merchant table"
-                        if 'input' in data and 'output' in data:
-                            tags += ",recipe"
-                        if 'craftingRecipes' in data and data['craftingRecipes']:
-                            tags += ",recipe list"
-                        if ('_drops' in data and data['_drops'] and 'drops' in data['_drops'][0] and data['_drops'][0]['drops']) or \
-                            ('_foliage' in data and data['_foliage'] and 'drops' in data['_foliage']):
-                            tags += ",drop table"
-                        if ('drops' in data and 'drops' in data['drops']):
-                            tags += ",destructible"
-                        if 'fish' in data and data['fish'] and 'drops' in data['fish'] and data['fish']['drops']:
-                            if 'large' in data:
-                                tags += ",fish net"
-                            else:
-                                tags += ",fish spawner"
-                        if 'cropStages' in data:
-                            tags += ",seed"
-
-                    except:
-                        tags = ",unparseable"
-
-                label_file.write(filename + tags +'\n')
-
-        toc = time.perf_counter()
-        logging.debug(f"Read all files in {toc - tic:0.4f} seconds")
-
-
+        return labels
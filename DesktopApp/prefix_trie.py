@@ -0,0 +1,42 @@
+class PrefixTrie:
+    """
+    Maps string prefixes to values, and finds the value for a name by walking
+    it one character at a time, so the cost of a lookup depends on the length
+    of the name rather than on how many prefixes were added.
+
+    When more than one prefix matches a name, the one that was added first wins,
+    the same as checking a list of prefixes with startswith in order.
+    """
+    def __init__(self):
+        self.root = {}
+        self.count = 0
+
+    def add(self, prefix, value):
+        node = self.root
+        for c in prefix:
+            node = node.setdefault(c, {})
+
+        # None is never a character, so it can't clash with a child node
+        if None not in node:
+            node[None] = (self.count, value)
+            self.count += 1
+
+    def match(self, name, default=None):
+        """
+        Returns the value for the earliest added prefix of name, or default if none match.
+        """
+        best = None
+        node = self.root
+        for c in name:
+            node = node.get(c)
+            if node is None:
+                break
+
+            found = node.get(None)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+
+        if best is None:
+            return default
+
+        return best[1]
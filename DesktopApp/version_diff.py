@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import logging
+from collections import Counter
+
+from DesktopApp.Modules import SunHaven_Item as ItemParser
+from DesktopApp.Modules import SunHaven_Recipe as RecipeParser
+from DesktopApp.Modules import SunHaven_DropTable as DropTableParser
+from DesktopApp.Modules import SunHaven_Merchant as MerchantParser
+from DesktopApp.SunHaven_Linker import jsonParse
+from DesktopApp.parser import Parser
+from DesktopApp.progress import Progress
+
+def _value(value):
+    """
+    Turns a field into something json can hold and == can compare.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [str(x) for x in value]
+    return str(value)
+
+def _groupKeys(records):
+    """
+    Takes [(key, filename, record)] and returns {key: {filename: record}}, so records that
+    share a key are kept apart by the file they came from.
+    """
+    result = {}
+    for key, filename, record in records:
+        result.setdefault(key, {}).setdefault(os.path.basename(filename), record)
+
+    return result
+
+def _files(parser: Parser, tag):
+    return [x['filename'] for x in parser.assets_parser.getMetadata(parser.dstPath) if tag in x['tags']]
+
+def itemRecords(parser: Parser):
+    records = []
+    for item in jsonParse(parser, _files(parser, 'item'), ItemParser.getItem):
+        if not item._gID:
+            continue
+
+        fields = {name: _value(value) for name, value in vars(item).items() if name not in ('filename', 'pID', '_gID')}
+        records.append((str(item.gID), item.filename, fields))
+
+    return _groupKeys(records)
+
+def recipeRecords(parser: Parser):
+    recipes = jsonParse(parser, _files(parser, 'recipe'), RecipeParser.getRecipe)
+
+    datumList = [x.output for x in recipes]
+    for recipe in recipes:
+        datumList.extend(recipe.inputs)
+    parser.assets_parser.csvParseAssetFile(datumList)
+
+    records = []
+    for recipe in recipes:
+        fields = {
+            'name': recipe.name,
+            'craftTime': recipe.craftTime,
+            'amount': recipe.output.amount,
+            'inputs': [f"{x.name}*{x.amount}" for x in recipe.inputs],
+        }
+        records.append((recipe.output.name, recipe.filename, fields))
+
+    return _groupKeys(records)
+
+def dropTableRecords(parser: Parser):
+    enemies = [x for x in jsonParse(parser, _files(parser, 'drop table'), DropTableParser.getDropTable) if isinstance(x, DropTableParser.Enemy)]
+
+    datumList = []
+    for enemy in enemies:
+        datumList.extend(enemy.drops)
+    parser.assets_parser.csvParseAssetFile(datumList)
+
+    records = []
+    for enemy in enemies:
+        fields = {
+            'spawner': enemy.spawner,
+            'health': enemy.health,
+            'experience': enemy.experience,
+            'defense': enemy.defense,
+            'flying': enemy.flying,
+            'drops': [f"{x.name} {x.amount} {round(x.percent_chance, 2)}%" for x in enemy.drops],
+        }
+        records.append((f"{enemy.name} (level {enemy.level})", enemy.filename, fields))
+
+    return _groupKeys(records)
+
+def merchantRecords(parser: Parser):
+    merchants = jsonParse(parser, _files(parser, 'merchant table'), MerchantParser.getMerchant)
+
+    datumList = []
+    for merchant in merchants:
+        datumList.extend(merchant.items)
+    parser.assets_parser.csvParseAssetFile(datumList)
+
+    return _groupKeys([(merchant.filename, merchant.filename, {'items': [str(x) for x in merchant.items]}) for merchant in merchants])
+
+# What gets compared, and how each kind of record is keyed
+recordTypes = {
+    'Items': itemRecords,
+    'Recipes': recipeRecords,
+    'Drop Tables': dropTableRecords,
+    'Merchants': merchantRecords,
+}
+
+def snapshot(parser: Parser):
+    """
+    Returns {record type: {key: {filename: {field: value}}}} for one game version.
+    """
+    result = {}
+    try:
+        for label, getRecords in recordTypes.items():
+            parser.on_progress_update(Progress(f"Reading {label.lower()} for {parser.gameVersion}..."))
+            result[label] = getRecords(parser)
+            logging.debug(f"Found {len(result[label])} {label.lower()} in {parser.gameVersion}")
+    finally:
+        parser.shutdownExecutor()
+        parser.assets_parser.clearIndexes()
+
+    return result
+
+def diffFields(old, new):
+    """
+    Returns {field: change} for every field that differs. Lists are compared as multisets,
+    so reordering one isn't a change, and their change is {"added": [...], "removed": [...]}.
+    Everything else changes as [old, new].
+    """
+    changes = {}
+    for field in old.keys() | new.keys():
+        old_value = old.get(field)
+        new_value = new.get(field)
+        if old_value == new_value:
+            continue
+
+        if isinstance(old_value, list) and isinstance(new_value, list):
+            old_counts = Counter(old_value)
+            new_counts = Counter(new_value)
+            if old_counts == new_counts:
+                continue
+
+            changes[field] = {
+                'added': sorted((new_counts - old_counts).elements()),
+                'removed': sorted((old_counts - new_counts).elements()),
+            }
+        else:
+            changes[field] = [old_value, new_value]
+
+    return changes
+
+def _joinGroup(key, old_group, new_group):
+    """
+    Pairs up the records two versions have for one key, yielding (label, old record, new record)
+    with None for a side that doesn't have it. A key with one record in each version is joined
+    on the key alone. Otherwise records are joined on their filename, and labeled "key / filename"
+    so a record keeps the same label no matter what happens to the others with its key.
+    """
+    if len(old_group) == 1 and len(new_group) == 1:
+        yield (key, next(iter(old_group.values())), next(iter(new_group.values())))
+        return
+
+    for filename in sorted(old_group.keys() | new_group.keys()):
+        label = key if len(old_group) <= 1 and len(new_group) <= 1 else f"{key} / {filename}"
+        yield (label, old_group.get(filename), new_group.get(filename))
+
+def diffSnapshots(old, new):
+    """
+    Joins two snapshots on their keys and returns {record type: {"added": [keys], "removed": [keys], "changed": {key: changes}}}.
+    Record types keyed by something other than a name also get "names": {key: name}.
+    """
+    result = {}
+    for label in recordTypes:
+        old_groups = old.get(label, {})
+        new_groups = new.get(label, {})
+
+        added = []
+        removed = []
+        changed = {}
+        names = {}
+        for key in old_groups.keys() | new_groups.keys():
+            for record_label, old_record, new_record in _joinGroup(key, old_groups.get(key, {}), new_groups.get(key, {})):
+                if old_record is None:
+                    added.append(record_label)
+                elif new_record is None:
+                    removed.append(record_label)
+                else:
+                    changes = diffFields(old_record, new_record)
+                    if not changes:
+                        continue
+                    changed[record_label] = changes
+
+                # Names for records keyed by something else, like items by gID, taken from the newest version that has them
+                record = new_record or old_record
+                if record.get('name') and record['name'] != key:
+                    names[record_label] = record['name']
+
+        result[label] = {
+            'added': sorted(added),
+            'removed': sorted(removed),
+            'changed': {key: changed[key] for key in sorted(changed)},
+        }
+        if names:
+            result[label]['names'] = names
+
+    return result
+
+def _wikiValue(value):
+    return "''none''" if value in (None, '') else str(value)
+
+def toChangelog(diff, old_version, new_version):
+    """
+    The diff as wiki text, a section for each record type that has any changes.
+    """
+    lines = [f"Changes from {old_version} to {new_version}", ""]
+
+    for label, changes in diff.items():
+        names = changes.get('names', {})
+
+        def title(key):
+            return f"{names[key]} ({key})" if key in names else key
+
+        if not (changes['added'] or changes['removed'] or changes['changed']):
+            continue
+
+        lines.append(f"== {label} ==")
+        if changes['added']:
+            lines.append("=== Added ===")
+            lines.extend([f"* {title(key)}" for key in changes['added']])
+        if changes['removed']:
+            lines.append("=== Removed ===")
+            lines.extend([f"* {title(key)}" for key in changes['removed']])
+        if changes['changed']:
+            lines.append("=== Changed ===")
+            for key, fields in changes['changed'].items():
+                lines.append(f"* {title(key)}")
+                for field in sorted(fields):
+                    change = fields[field]
+                    if isinstance(change, dict):
+                        for value in change['added']:
+                            lines.append(f"** {field}: added {value}")
+                        for value in change['removed']:
+                            lines.append(f"** {field}: removed {value}")
+                    else:
+                        lines.append(f"** {field}: {_wikiValue(change[0])} → {_wikiValue(change[1])}")
+        lines.append("")
+
+    return "\n".join(lines)
+
+def diffVersions(old_parser: Parser, new_parser: Parser, dstFolder):
+    """
+    Compares the records of two set up game versions, writing the changes to
+    <old>_to_<new>.json and a wiki changelog to <old>_to_<new>_changelog.txt in dstFolder.
+    """
+    diff = diffSnapshots(snapshot(old_parser), snapshot(new_parser))
+
+    os.makedirs(dstFolder, exist_ok=True)
+    name = f"{old_parser.gameVersion}_to_{new_parser.gameVersion}"
+
+    with open(os.path.join(dstFolder, f"{name}.json"), 'w', encoding='utf-8') as json_file:
+        json.dump(diff, json_file, separators=(',', ':'), ensure_ascii=False)
+
+    with open(os.path.join(dstFolder, f"{name}_changelog.txt"), 'w', encoding='utf-8') as changelog_file:
+        changelog_file.write(toChangelog(diff, old_parser.gameVersion, new_parser.gameVersion))
+
+    return diff
+
+
+if __name__ == '__main__':
+    # python -m DesktopApp.version_diff <old version> <old data path> <new version> <new data path> <output path>
+    # Both versions need to have been set up by the app already, so their fileTypes.csv exists under output path
+    old_version, old_data, new_version, new_data, output_path = sys.argv[1:6]
+
+    def on_progress_update(progress):
+        print(progress.message)
+
+    old_parser = Parser(old_version, old_data, "", output_path, on_progress_update, skip_setup=True)
+    new_parser = Parser(new_version, new_data, "", output_path, on_progress_update, skip_setup=True)
+    diffVersions(old_parser, new_parser, os.path.join(output_path, "diffs"))
@@ -1,5 +1,6 @@
 import os
 import threading
+import multiprocessing
 import logging
 import tkinter as tk
 from tkinter import ttk
@@ -263,6 +264,8 @@ class SunHavenRipperApp:
         self.window.mainloop()
 
 if __name__ == '__main__':
+    # Needed so the file labelling worker processes can start from a frozen (pyinstaller) build
+    multiprocessing.freeze_support()
     logging.basicConfig(level=logging.DEBUG, filename="sun_haven_ripper_debug.log")  
     app = SunHavenRipperApp()
     app.start()
@@ -1,51 +1,129 @@
 import os
+import sys
+import shutil
 import difflib
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
 
-if __name__ == '__main__':
-    old_folder = "D:\\Documents\\Sun Haven Assets\\output\\full_1.2"
-    updated_folder = "D:\\Documents\\Sun Haven Assets\\output\\full_1.2_copy"
-    diff_folder = "D:\\Documents\\Sun Haven Assets\\output\\diffs"
-    
+def fileHash(path, chunk_size=1024 * 1024):
+    """
+    sha256 of a file, read a chunk at a time so big outputs don't have to fit in memory.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def isUnchanged(old_path, updated_path):
+    # Files of different sizes can't match, so only hash the ones that might
+    if os.path.getsize(old_path) != os.path.getsize(updated_path):
+        return False
+    return fileHash(old_path) == fileHash(updated_path)
+
+def diffFile(old_path, updated_path, diff_path):
+    """
+    Writes the html diff of two files to diff_path, if there are any differences between their lines.
+
+    Returns (lines added, lines removed). This runs in a worker process, one pair of files at a time.
+    """
+    with open(old_path, 'r', encoding='utf-8') as old_file:
+        old_lines = old_file.readlines()
+    with open(updated_path, 'r', encoding='utf-8') as updated_file:
+        updated_lines = updated_file.readlines()
+
+    added = 0
+    removed = 0
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, updated_lines, autojunk=False).get_opcodes():
+        if tag != 'equal':
+            removed += i2 - i1
+            added += j2 - j1
+
+    # Only line endings changed, HtmlDiff would have said "No Differences Found"
+    if not added and not removed:
+        return (0, 0)
+
+    diff = difflib.HtmlDiff().make_file(
+        fromlines=old_lines,
+        tolines=updated_lines,
+        context=True,
+        numlines=8
+    )
+
+    with open(diff_path, 'w', encoding='utf-8') as diff_file:
+        diff_file.writelines(diff)
+
+    return (added, removed)
+
+def diffFolders(old_folder, updated_folder, diff_folder, workers=None):
+    """
+    Diffs every output file in old_folder against the one with the same name in updated_folder.
+
+    Identical files are found by size and hash and skipped. The rest are diffed in a
+    process pool, and summary.csv in diff_folder lists what happened to every file.
+    """
     if not os.path.exists(diff_folder):
         os.mkdir(diff_folder)
-    
-    for file_name in os.listdir(old_folder):
-        print(f"Checking {file_name} for changes...")
-        
+
+    summary = []
+    to_diff = []
+    for file_name in sorted(os.listdir(old_folder)):
+        old_path = os.path.join(old_folder, file_name)
+        if not os.path.isfile(old_path):
+            continue
+
         if file_name.startswith("fileTypes"):
             print("Skipping file types file.")
             continue
-        
+
         matching_updated_file = os.path.join(updated_folder, file_name)
         if not os.path.exists(matching_updated_file):
             print(f"{file_name} not in updated folder, writing to diffs...")
-            with open(f"{diff_folder}/{file_name}", 'w', encoding='utf-8') as diff_file:
-                with open(os.path.join(old_folder, file_name), 'r', encoding='utf-8') as old_file:
-                    diff_file.writelines(old_file.readlines())
+            shutil.copyfile(old_path, os.path.join(diff_folder, file_name))
+            summary.append((file_name, "removed", 0, 0))
+        elif isUnchanged(old_path, matching_updated_file):
+            print(f"No difference in {file_name}.")
+            summary.append((file_name, "unchanged", 0, 0))
         else:
-            with open(os.path.join(old_folder, file_name), 'r', encoding='utf-8') as old_file:
-                with open(matching_updated_file, 'r', encoding='utf-8') as updated_file:
-                    diff = difflib.HtmlDiff().make_file(
-                        fromlines=old_file.readlines(),
-                        tolines=updated_file.readlines(),
-                        context=True,
-                        numlines=8
-                    )
-                    
-                    with open(os.path.join(diff_folder, file_name.split('.')[0] + ".html"), 'w') as diff_file:
-                        diff_file.writelines(diff)
-        
-    for diff_file_name in os.listdir(diff_folder):
-        files_to_delete = []
-        
-        diff_path = os.path.join(diff_folder, diff_file_name)
-        
-        diff_file = open(diff_path)
-        if 'No Differences Found' in diff_file.read():
-            files_to_delete.append(diff_path)
-        diff_file.close()
-            
-        for file in files_to_delete:
-            print(f"No difference in {diff_file_name}.")
-            os.remove(diff_path)
\ No newline at end of file
+            to_diff.append(file_name)
+
+    for file_name in sorted(os.listdir(updated_folder)):
+        if os.path.isfile(os.path.join(updated_folder, file_name)) and not file_name.startswith("fileTypes") \
+                and not os.path.exists(os.path.join(old_folder, file_name)):
+            summary.append((file_name, "new", 0, 0))
+
+    if to_diff:
+        print(f"Diffing {len(to_diff)} changed files...")
+        old_paths = [os.path.join(old_folder, x) for x in to_diff]
+        updated_paths = [os.path.join(updated_folder, x) for x in to_diff]
+        diff_paths = [os.path.join(diff_folder, x + ".html") for x in to_diff]
+
+        # Each worker only holds one pair of files at a time
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for file_name, (added, removed) in zip(to_diff, pool.map(diffFile, old_paths, updated_paths, diff_paths)):
+                if added or removed:
+                    print(f"{file_name}: +{added} -{removed}")
+                    summary.append((file_name, "changed", added, removed))
+                else:
+                    print(f"No difference in {file_name}.")
+                    summary.append((file_name, "unchanged", 0, 0))
+
+    summary.sort()
+    with open(os.path.join(diff_folder, "summary.csv"), 'w', encoding='utf-8') as summary_file:
+        summary_file.write("file,status,added,removed\n")
+        for file_name, status, added, removed in summary:
+            summary_file.write(f"{file_name},{status},{added},{removed}\n")
+
+    return summary
+
+
+if __name__ == '__main__':
+    old_folder = "D:\\Documents\\Sun Haven Assets\\output\\full_1.2"
+    updated_folder = "D:\\Documents\\Sun Haven Assets\\output\\full_1.2_copy"
+    diff_folder = "D:\\Documents\\Sun Haven Assets\\output\\diffs"
+
+    if len(sys.argv) == 4:
+        old_folder, updated_folder, diff_folder = sys.argv[1:]
+
+    diffFolders(old_folder, updated_folder, diff_folder)